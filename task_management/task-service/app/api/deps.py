@@ -1,15 +1,17 @@
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 # 1. Import BaseModel
 from pydantic import BaseModel 
 
-from ..db import get_db
+from ..db import get_db, get_async_db
 from ..auth.jwt import decode_access_token 
 
 security = HTTPBearer()
-SessionDep = Annotated[Session, Depends(get_db)]
+# Session đồng bộ cho các endpoint xử lý nặng chạy trong threadpool (vd. import)
+SyncSessionDep = Annotated[Session, Depends(get_db)]
 
 # 2. Định nghĩa Schema cho Token Payload
 class TokenPayload(BaseModel):
@@ -41,4 +43,15 @@ async def get_current_user(
     return token_data
 
 # Type Alias
-CurrentUser = Annotated[TokenPayload, Depends(get_current_user)]
\ No newline at end of file
+CurrentUser = Annotated[TokenPayload, Depends(get_current_user)]
+
+
+async def get_user_db(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: CurrentUser
+) -> AsyncSession:
+    # user_id dùng cho read-your-writes khi định tuyến sang read replica
+    db.info["user_id"] = current_user.id
+    return db
+
+SessionDep = Annotated[AsyncSession, Depends(get_user_db)]
\ No newline at end of file
@@ -0,0 +1,103 @@
+# task_management/task-service/app/core/acl_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from prometheus_client import Counter
+
+from .config import settings
+
+ACL_CACHE_REQUESTS = Counter(
+    "task_acl_cache_requests_total",
+    "Board ACL cache lookups",
+    ["cache", "result"],
+)
+
+
+class TTLCache:
+    """LRU có giới hạn số phần tử, mỗi phần tử hết hạn sau `ttl_seconds`. Thread-safe."""
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = ACL_CACHE_REQUESTS.labels(cache=name, result="hit")
+        self._misses = ACL_CACHE_REQUESTS.labels(cache=name, result="miss")
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        self._misses.inc()
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        with self._lock:
+            stale = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                del self._entries[key]
+
+
+class BoardAclCache:
+    """
+    Cache quyền truy cập board cho các thao tác card/column:
+    - (user_id, board_id) -> role của BoardMember
+    - column_id -> board_id
+
+    Chỉ cache kết quả dương (là member / column tồn tại), nên thêm member mới
+    có hiệu lực ngay; việc thu hồi quyền được giới hạn bởi TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.roles = TTLCache("board_role", max_entries, ttl_seconds)
+        self.column_boards = TTLCache("column_board", max_entries, ttl_seconds)
+
+    def get_role(self, user_id: int, board_id: int) -> Optional[str]:
+        return self.roles.get((user_id, board_id))
+
+    def set_role(self, user_id: int, board_id: int, role: str) -> None:
+        self.roles.set((user_id, board_id), role)
+
+    def get_column_board(self, column_id: int) -> Optional[int]:
+        return self.column_boards.get(column_id)
+
+    def set_column_board(self, column_id: int, board_id: int) -> None:
+        self.column_boards.set(column_id, board_id)
+
+    def invalidate_member(self, board_id: int, user_id: int) -> None:
+        self.roles.pop((user_id, board_id))
+
+    def invalidate_column(self, column_id: int) -> None:
+        self.column_boards.pop(column_id)
+
+    def invalidate_board(self, board_id: int) -> None:
+        self.roles.pop_where(lambda key, _: key[1] == board_id)
+        self.column_boards.pop_where(lambda _, value: value == board_id)
+
+
+acl_cache = BoardAclCache(
+    max_entries=settings.ACL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ACL_CACHE_TTL_SECONDS,
+)
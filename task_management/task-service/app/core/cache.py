@@ -0,0 +1,94 @@
+# task_management/task-service/app/core/cache.py
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+
+from .config import settings
+from .singleflight import SingleFlight
+
+
+class BoardSnapshotCache:
+    """
+    Cache JSON snapshot của board theo (board_id, version).
+
+    - Tầng 1: LRU trong process, mỗi board chỉ giữ snapshot của version mới nhất.
+    - Tầng 2 (tuỳ chọn): Redis, chia sẻ giữa các replica, hết hạn theo TTL.
+
+    Version được tăng trong cùng transaction với mọi thay đổi của board,
+    nên không cần xoá cache chủ động: key cũ đơn giản là không còn được đọc.
+    """
+
+    KEY_PREFIX = "task:board_snapshot"
+
+    def __init__(self, max_entries: int, ttl_seconds: int, redis_url: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = (
+            aioredis.Redis.from_url(redis_url, socket_timeout=1.0) if redis_url else None
+        )
+
+    def _redis_key(self, board_id: int, version: int) -> str:
+        return f"{self.KEY_PREFIX}:{board_id}:{version}"
+
+    async def get(self, board_id: int, version: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(board_id)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(board_id)
+                return entry[1]
+
+        if self._redis is None:
+            return None
+
+        try:
+            body = await self._redis.get(self._redis_key(board_id, version))
+        except redis.RedisError as e:
+            logger.warning(f"Board cache: Redis get failed: {e}")
+            return None
+
+        if body is not None:
+            self._store_local(board_id, version, body)
+        return body
+
+    async def set(self, board_id: int, version: int, body: bytes) -> None:
+        self._store_local(board_id, version, body)
+
+        if self._redis is None:
+            return
+
+        try:
+            await self._redis.set(self._redis_key(board_id, version), body, ex=self.ttl_seconds)
+        except redis.RedisError as e:
+            logger.warning(f"Board cache: Redis set failed: {e}")
+
+    def invalidate(self, board_id: int) -> None:
+        with self._lock:
+            self._entries.pop(board_id, None)
+
+    def _store_local(self, board_id: int, version: int, body: bytes) -> None:
+        with self._lock:
+            current = self._entries.get(board_id)
+            # Không ghi đè snapshot mới hơn bằng một snapshot cũ (request chậm)
+            if current and current[0] > version:
+                return
+            self._entries[board_id] = (version, body)
+            self._entries.move_to_end(board_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+board_snapshot_cache = BoardSnapshotCache(
+    max_entries=settings.BOARD_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.BOARD_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL,
+)
+
+# Gộp các lần load snapshot đồng thời khi cache miss (vd. cả team mở cùng một board)
+board_snapshot_flight = SingleFlight("board_snapshot")
@@ -1,12 +1,69 @@
 
 # task_management/task-service/app/core/config.py
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Mặc định suy ra từ DATABASE_URL với driver asyncpg
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Connection pool của SQLAlchemy
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Kết nối qua PgBouncer ở chế độ transaction pooling
+    DB_PGBOUNCER: bool = False
+
+    # Read replica (tuỳ chọn) cho các API chỉ đọc; sau khi ghi, đọc của user
+    # đó đi vào primary trong READ_YOUR_WRITES_SECONDS (chia sẻ giữa các replica qua REDIS_URL)
+    READ_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Ghi log câu SQL chạy lâu hơn ngưỡng này (kèm tham số)
+    SLOW_QUERY_THRESHOLD_MS: int = 200
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Board snapshot cache (Redis là tầng tuỳ chọn)
+    REDIS_URL: Optional[str] = None
+    BOARD_CACHE_MAX_ENTRIES: int = 512
+    BOARD_CACHE_TTL_SECONDS: int = 300
+
+    # ACL cache cho kiểm tra quyền board member
+    ACL_CACHE_MAX_ENTRIES: int = 10000
+    ACL_CACHE_TTL_SECONDS: int = 30
+
+    # Rebalance key sắp xếp của card/column khi dài quá ngưỡng này
+    ORDER_KEY_MAX_LENGTH: int = 24
+
+    # Domain event (outbox) -> Kafka; không cấu hình Kafka thì event chỉ nằm trong outbox
+    KAFKA_BOOTSTRAP_SERVERS: Optional[str] = None
+    KAFKA_TASK_EVENTS_TOPIC: str = "task_events"
+    KAFKA_COMPRESSION_TYPE: Optional[str] = "gzip"
+    KAFKA_LINGER_MS: int = 20
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 0.5
+
+    # Delta sync: nhiều thay đổi hơn ngưỡng này thì client tải lại cả board
+    BOARD_SYNC_MAX_CHANGES: int = 2000
+    # Tombstone (card / column đã xoá) chỉ giữ cho N version gần nhất của board:
+    # `since` cũ hơn thì client tải lại cả board. Xoá định kỳ ở background theo lô
+    BOARD_SYNC_TOMBSTONE_VERSIONS: int = 1000
+    BOARD_SYNC_TOMBSTONE_PRUNE_CHUNK_SIZE: int = 5000
+    BOARD_SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS: float = 300
+
+    # Xoá vĩnh viễn board ở background: số card mỗi transaction, nghỉ giữa các lô
+    BOARD_PURGE_CHUNK_SIZE: int = 1000
+    BOARD_PURGE_PAUSE_SECONDS: float = 0.05
+
+    # Realtime (SSE) theo board: số message chờ tối đa mỗi kết nối, chu kỳ heartbeat
+    REALTIME_QUEUE_SIZE: int = 256
+    REALTIME_HEARTBEAT_SECONDS: float = 15.0
     
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
@@ -0,0 +1,32 @@
+# task_management/task-service/app/core/fields.py
+
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from starlette import status
+
+
+# Sparse fieldset: `?fields=title,position` chỉ load và trả về các field được chọn.
+def parse_fields(
+    fields: Optional[str],
+    allowed: Sequence[str],
+    default: Sequence[str],
+    required: Sequence[str] = ("id",)
+) -> tuple[str, ...]:
+    """
+    Parse `fields` (tên field cách nhau bởi dấu phẩy) thành tuple theo thứ tự của `allowed`.
+    Không truyền thì dùng `default`; field trong `required` luôn có; field lạ trả về 400.
+    """
+    if fields is None:
+        selected = set(default)
+    else:
+        selected = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = selected.difference(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+    selected.update(required)
+    return tuple(name for name in allowed if name in selected)
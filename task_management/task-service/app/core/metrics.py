@@ -0,0 +1,90 @@
+# task_management/task-service/app/core/metrics.py
+
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+
+from loguru import logger
+from prometheus_client import Histogram
+from sqlalchemy import event
+
+from .config import settings
+from .tracing import tracer
+
+SQL_QUERY_DURATION = Histogram(
+    "task_sql_query_duration_seconds",
+    "SQL statement execution time, by service method",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# Service method đang chạy, vd. "CardService.update"; SQL ngoài service được gắn "other"
+current_operation: ContextVar[str] = ContextVar("current_operation", default="other")
+
+_MAX_LOGGED_PARAMS = 2000
+
+
+def instrument_service(cls):
+    """
+    Class decorator: mỗi method public của service chạy trong một span "Class.method"
+    và gắn tên đó vào current_operation, để SQL timing biết câu lệnh thuộc method nào.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(method):
+            continue
+        setattr(cls, name, _with_operation(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _with_operation(operation: str, method):
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            token = current_operation.set(operation)
+            try:
+                with tracer.start_as_current_span(operation):
+                    return await method(*args, **kwargs)
+            finally:
+                current_operation.reset(token)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = current_operation.set(operation)
+        try:
+            with tracer.start_as_current_span(operation):
+                return method(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+    return wrapper
+
+
+def instrument_engine(engine) -> None:
+    """Đo thời gian từng câu SQL (histogram) và ghi log câu chậm hơn SLOW_QUERY_THRESHOLD_MS."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started_at"].pop()
+        elapsed = time.perf_counter() - started
+        operation = current_operation.get()
+        SQL_QUERY_DURATION.labels(operation=operation).observe(elapsed)
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            params = repr(parameters)
+            if len(params) > _MAX_LOGGED_PARAMS:
+                params = params[:_MAX_LOGGED_PARAMS] + "..."
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms) in {operation}: {statement} | params: {params}"
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # Câu lệnh lỗi không có after_cursor_execute: bỏ mốc thời gian tương ứng
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
@@ -0,0 +1,30 @@
+# task_management/task-service/app/core/pagination.py
+
+import base64
+import json
+from typing import Any
+
+from fastapi import HTTPException
+from starlette import status
+
+
+# Cursor là chuỗi opaque (base64 của JSON) chứa giá trị sort key của phần tử cuối trang.
+# Client chỉ cần gửi lại nguyên văn `next_cursor`, không được tự tạo.
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
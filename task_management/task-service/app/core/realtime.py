@@ -0,0 +1,153 @@
+# task_management/task-service/app/core/realtime.py
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+from prometheus_client import Counter, Gauge
+
+from .config import settings
+
+REALTIME_SUBSCRIBERS = Gauge(
+    "task_realtime_subscribers",
+    "Open realtime (SSE) board subscriptions in this process",
+)
+REALTIME_DROPPED = Counter(
+    "task_realtime_dropped_subscribers_total",
+    "Subscribers told to resync because they fell too far behind",
+)
+
+# Client đọc không kịp: bỏ các message đang chờ, báo client tải lại board (GET /boards/{id} với ETag)
+_RESYNC = object()
+_RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+_HEARTBEAT_FRAME = b": ping\n\n"
+
+
+def sse_frame(event_id: int, event_type: str, data: str) -> bytes:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n".encode()
+
+
+class BoardEventHub:
+    """
+    Fan-out event của board tới các kết nối realtime (SSE) đang mở.
+
+    - Không có Redis: chỉ fan-out trong process.
+    - Có REDIS_URL: event được publish lên Redis pub/sub (kênh theo board), mỗi replica
+      nghe pattern chung và chuyển tiếp cho subscriber của mình.
+
+    Message được encode thành SSE frame một lần, mọi subscriber dùng chung bytes đó.
+    Best effort: mất message thì client vẫn có ETag của GET /boards/{id} để bắt kịp.
+    """
+
+    CHANNEL_PREFIX = "task:board_events"
+
+    def __init__(self, queue_size: int, heartbeat_seconds: float, redis_url: Optional[str] = None):
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._redis = aioredis.Redis.from_url(redis_url) if redis_url else None
+        self._listener: Optional[asyncio.Task] = None
+        self._publishing: set[asyncio.Task] = set()
+
+    def publish_nowait(self, frames: list[tuple[int, bytes]]) -> None:
+        """Gửi (board_id, frame) sau khi transaction commit; không chặn request."""
+        if not frames:
+            return
+        if self._redis is None:
+            for board_id, frame in frames:
+                self._deliver(board_id, frame)
+            return
+
+        task = asyncio.get_running_loop().create_task(self._publish(frames))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _publish(self, frames: list[tuple[int, bytes]]) -> None:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for board_id, frame in frames:
+                    pipe.publish(f"{self.CHANNEL_PREFIX}:{board_id}", frame)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Realtime: Redis publish failed: {e}")
+
+    async def stream(self, board_id: int) -> AsyncIterator[bytes]:
+        """SSE stream của một board: event, heartbeat định kỳ, hoặc resync rồi đóng."""
+        queue = self._subscribe(board_id)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield _HEARTBEAT_FRAME
+                    continue
+
+                if frame is _RESYNC:
+                    yield _RESYNC_FRAME
+                    return
+                yield frame
+        finally:
+            self._unsubscribe(board_id, queue)
+
+    def _subscribe(self, board_id: int) -> asyncio.Queue:
+        if self._redis is not None and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen(), name="realtime-listener")
+
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(board_id, set()).add(queue)
+        REALTIME_SUBSCRIBERS.inc()
+        return queue
+
+    def _unsubscribe(self, board_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(board_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[board_id]
+        REALTIME_SUBSCRIBERS.dec()
+
+    def _deliver(self, board_id: int, frame: bytes) -> None:
+        for queue in self._subscribers.get(board_id, ()):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_RESYNC)
+                REALTIME_DROPPED.inc()
+
+    async def _listen(self) -> None:
+        prefix = f"{self.CHANNEL_PREFIX}:"
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{prefix}*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        board_id = int(message["channel"].decode().removeprefix(prefix))
+                        self._deliver(board_id, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except (redis.RedisError, ValueError) as e:
+                logger.warning(f"Realtime: Redis subscription failed, reconnecting: {e}")
+                await asyncio.sleep(1)
+
+    async def shutdown(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+board_event_hub = BoardEventHub(
+    queue_size=settings.REALTIME_QUEUE_SIZE,
+    heartbeat_seconds=settings.REALTIME_HEARTBEAT_SECONDS,
+    redis_url=settings.REDIS_URL,
+)
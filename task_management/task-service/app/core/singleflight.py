@@ -0,0 +1,58 @@
+# task_management/task-service/app/core/singleflight.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from prometheus_client import Counter
+
+SINGLEFLIGHT_CALLS = Counter(
+    "task_singleflight_calls_total",
+    "Single-flight calls, by whether they ran the load or joined one already in flight",
+    ["flight", "result"],
+)
+
+
+class SingleFlight:
+    """
+    Gộp các lời gọi đồng thời cùng key trong process: chỉ lời gọi đầu tiên (leader) chạy
+    `load`, các lời gọi đến trong lúc đó chờ và nhận cùng kết quả (cùng object) hoặc cùng lỗi.
+
+    Leader bị huỷ (vd. client ngắt kết nối) thì một trong các lời gọi đang chờ chạy lại `load`,
+    nên `load` chỉ được dùng tài nguyên của lời gọi chạy nó (vd. session DB của request đó).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._leaders = SINGLEFLIGHT_CALLS.labels(flight=name, result="leader")
+        self._joined = SINGLEFLIGHT_CALLS.labels(flight=name, result="joined")
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        while (future := self._calls.get(key)) is not None:
+            self._joined.inc()
+            try:
+                # shield: waiter bị huỷ không được huỷ kết quả của các waiter khác
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._leaders.inc()
+        try:
+            result = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Đánh dấu đã đọc: không có waiter thì asyncio không log "exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -0,0 +1,64 @@
+import functools
+import inspect
+import os
+
+from loguru import logger
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+# ProxyTracer: span chỉ được ghi sau khi setup_tracing đã gắn TracerProvider
+tracer = trace.get_tracer("task-service")
+
+
+def setup_tracing(app, engines):
+    service_name = os.getenv("OTEL_SERVICE_NAME", "task-service")
+    otel_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://tempo:4317")
+
+    try:
+        resource = Resource.create(attributes={
+            "service.name": service_name
+        })
+
+        tracer_provider = TracerProvider(resource=resource)
+        trace.set_tracer_provider(tracer_provider)
+
+        otlp_exporter = OTLPSpanExporter(endpoint=otel_endpoint, insecure=True)
+        tracer_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
+
+        FastAPIInstrumentor.instrument_app(app, tracer_provider=tracer_provider)
+
+        # Một span cho mỗi câu SQL, trên mọi engine (primary sync/async, replica)
+        SQLAlchemyInstrumentor().instrument(
+            engines=engines,
+            tracer_provider=tracer_provider,
+            enable_commenter=False
+        )
+
+        logger.success(f"Tracing enabled for {service_name} -> {otel_endpoint}")
+
+    except Exception as e:
+        logger.error(f"Failed to setup tracing: {e}")
+
+
+def traced(name: str):
+    """Bọc hàm (sync hoặc async) trong một span tên `name`."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -1,16 +1,61 @@
 # task_management/task-service/app/db/__init__.py
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
+from ..core.metrics import instrument_engine
+from .pool import engine_options, instrument_pool
+from .routing import RoutingAsyncSession, RoutingSession
 
-engine = create_engine(settings.DATABASE_URL)
+# Engine đồng bộ: dùng cho tác vụ nền (rebalance, import, export, purge); schema do Alembic quản lý (app/db/migrate.py)
+_sync_url = make_url(settings.DATABASE_URL)
+engine = create_engine(_sync_url, **engine_options("task_sync", _sync_url))
+instrument_pool(engine)
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: URL) -> URL:
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+# Engine bất đồng bộ (asyncpg): dùng cho các request API
+_async_url = make_url(settings.ASYNC_DATABASE_URL) if settings.ASYNC_DATABASE_URL else _async_database_url(_sync_url)
+async_engine = create_async_engine(_async_url, **engine_options("task_async", _async_url))
+instrument_pool(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+
+replica_engine = None
+if settings.READ_REPLICA_URL:
+    _replica_url = _async_database_url(make_url(settings.READ_REPLICA_URL))
+    replica_engine = create_async_engine(_replica_url, **engine_options("task_replica", _replica_url))
+    instrument_pool(replica_engine.sync_engine)
+    instrument_engine(replica_engine.sync_engine)
+
+# expire_on_commit=False: object trả về sau commit vẫn đọc được mà không cần lazy load
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=RoutingAsyncSession,
+    sync_session_class=RoutingSession,
+    replica_bind=replica_engine.sync_engine if replica_engine is not None else None,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,43 @@
+# task_management/task-service/app/db/migrate.py
+"""
+Migration lúc container khởi động: `python -m app.db.migrate` (thay cho `alembic upgrade head`).
+
+Database được tạo bằng Base.metadata.create_all trước khi có Alembic chưa có bảng
+alembic_version: `alembic upgrade head` sẽ chạy lại 0001 và lỗi "relation already exists".
+Trường hợp đó được stamp 0001_initial_schema (schema gốc) trước, rồi mới upgrade head.
+"""
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from loguru import logger
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import NullPool
+
+from ..core.config import settings
+
+BASELINE_REVISION = "0001_initial_schema"
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def is_unversioned_schema(database_url: str) -> bool:
+    """Có bảng của service (tạo bằng create_all) nhưng chưa có alembic_version."""
+    engine = create_engine(database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            tables = set(inspect(conn).get_table_names())
+    finally:
+        engine.dispose()
+    return "boards" in tables and "alembic_version" not in tables
+
+
+def main() -> None:
+    config = Config(str(ALEMBIC_INI))
+    if is_unversioned_schema(settings.DATABASE_URL):
+        logger.warning(f"Schema created without Alembic: stamping {BASELINE_REVISION} before upgrading")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# task_management/task-service/app/db/pool.py
+
+import time
+from uuid import uuid4
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from ..core.config import settings
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["pool"],
+)
+POOL_CONNECTIONS = Gauge(
+    "db_pool_open_connections",
+    "DBAPI connections currently open (idle + checked out)",
+    ["pool"],
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that failed because the pool stayed exhausted for pool_timeout",
+    ["pool"],
+)
+
+
+class _TimedCheckoutMixin:
+    # SQLAlchemy không có event trước checkout, nên đo thời gian chờ quanh _do_get
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(pool=self.logging_name).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(pool=self.logging_name).observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+
+def engine_options(name: str, url: URL) -> dict:
+    """
+    Tham số create_engine / create_async_engine theo Settings.
+
+    DB_PGBOUNCER=True (PgBouncer ở chế độ transaction pooling): PgBouncer giữ pool,
+    phía app mở kết nối theo từng checkout (NullPool) và không dùng prepared
+    statement có tên, vì transaction kế tiếp có thể chạy trên backend khác.
+    """
+    is_async = url.get_dialect().is_async
+    if settings.DB_PGBOUNCER:
+        options = {"poolclass": TimedNullPool, "pool_logging_name": name}
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_pool(engine) -> None:
+    """Cập nhật gauge checked-out / open connections từ các pool event của engine."""
+    pool = engine.pool
+    checked_out = POOL_CHECKED_OUT.labels(pool=pool.logging_name)
+    connections = POOL_CONNECTIONS.labels(pool=pool.logging_name)
+
+    event.listen(pool, "connect", lambda dbapi_conn, record: connections.inc())
+    event.listen(pool, "close", lambda dbapi_conn, record: connections.dec())
+    event.listen(pool, "close_detached", lambda dbapi_conn: connections.dec())
+    event.listen(pool, "checkout", lambda dbapi_conn, record, proxy: checked_out.inc())
+    event.listen(pool, "checkin", lambda dbapi_conn, record: checked_out.dec())
@@ -0,0 +1,154 @@
+# task_management/task-service/app/db/routing.py
+
+import functools
+import threading
+import time
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from ..core.config import settings
+from ..core.tracing import tracer
+
+USE_REPLICA = "use_replica"
+REPLICA_ALLOWED = "replica_allowed"
+# Transaction vừa commit có ghi dữ liệu: RoutingAsyncSession đánh dấu user sau commit
+_COMMITTED_WRITE = "committed_write"
+
+
+class RecentWriters:
+    """
+    Ghi nhớ user vừa commit thay đổi trong `window_seconds` gần nhất.
+    Trong khoảng đó, các đọc của user đi thẳng vào primary (read-your-writes),
+    để replica trễ không "hoàn tác" thao tác kéo thả user vừa làm.
+
+    - Trong process: dict hết hạn theo thời gian, kiểm tra trước (không tốn round trip).
+    - Có Redis: marker còn được ghi thành key với TTL = window, nên request tiếp theo
+      của user rơi vào replica task-service khác vẫn đọc từ primary.
+    """
+
+    KEY_PREFIX = "task:recent_writer"
+
+    def __init__(self, window_seconds: float, redis_url: Optional[str] = None, max_entries: int = 100000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._expires: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._redis = (
+            aioredis.Redis.from_url(redis_url, socket_timeout=1.0) if redis_url else None
+        )
+
+    def _redis_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}"
+
+    async def mark(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expires[user_id] = now + self.window_seconds
+            if len(self._expires) > self.max_entries:
+                self._expires = {uid: exp for uid, exp in self._expires.items() if exp > now}
+
+        if self._redis is None:
+            return
+
+        try:
+            await self._redis.set(self._redis_key(user_id), 1, px=max(int(self.window_seconds * 1000), 1))
+        except redis.RedisError as e:
+            logger.warning(f"Read-your-writes: Redis set failed: {e}")
+
+    async def is_recent(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            expires_at = self._expires.get(user_id)
+        if expires_at is not None and expires_at > time.monotonic():
+            return True
+
+        if self._redis is None:
+            return False
+
+        try:
+            return bool(await self._redis.exists(self._redis_key(user_id)))
+        except redis.RedisError as e:
+            # Không biết user có vừa ghi hay không: đọc từ primary luôn đúng
+            logger.warning(f"Read-your-writes: Redis exists failed: {e}")
+            return True
+
+
+# Chỉ cần chia sẻ qua Redis khi thật sự có read replica
+recent_writers = RecentWriters(
+    window_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    redis_url=settings.REDIS_URL if settings.READ_REPLICA_URL else None,
+)
+
+
+class RoutingSession(Session):
+    """
+    Session chọn engine cho từng câu lệnh: mặc định là primary, chỉ dùng replica
+    khi đang trong method @replica_read, không flush / ghi, và user không vừa ghi.
+    """
+
+    def __init__(self, *args, replica_bind: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        elif self.replica_bind is not None and self.info.get(USE_REPLICA) and self.info.get(REPLICA_ALLOWED):
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def commit(self) -> None:
+        # Span riêng cho commit (flush + COMMIT), tách khỏi thời gian các câu đọc
+        with tracer.start_as_current_span("db.commit"):
+            super().commit()
+
+
+class RoutingAsyncSession(AsyncSession):
+    """AsyncSession của request: sau commit có ghi, đánh dấu user cho read-your-writes."""
+
+    async def commit(self) -> None:
+        await super().commit()
+        # Ghi marker trước khi trả response: request tiếp theo của user chắc chắn thấy nó
+        user_id = self.info.get("user_id")
+        if self.info.pop(_COMMITTED_WRITE, False) and user_id is not None:
+            await recent_writers.mark(user_id)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session: Session) -> None:
+    if session.info.pop("wrote", False):
+        session.info[_COMMITTED_WRITE] = True
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(session: Session) -> None:
+    session.info.pop("wrote", None)
+    session.info.pop(_COMMITTED_WRITE, None)
+
+
+def replica_read(method):
+    """Đánh dấu method chỉ đọc của service (self.db là AsyncSession): được phép đọc từ replica."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        info = self.db.info
+        if REPLICA_ALLOWED not in info:
+            # Quyết định một lần cho cả session: các đọc liên tiếp trong một request
+            # (vd. version rồi snapshot của board) dùng cùng một nguồn và cùng connection
+            info[REPLICA_ALLOWED] = not await recent_writers.is_recent(info.get("user_id"))
+        previous = info.get(USE_REPLICA, False)
+        info[USE_REPLICA] = True
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info[USE_REPLICA] = previous
+
+    return wrapper
@@ -1,19 +1,36 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.responses import JSONResponse
 
 # Import Database Engine
-from .db import engine
-from .models import Base
+from .db import engine, async_engine, replica_engine
+from .core.realtime import board_event_hub
+from .core.tracing import setup_tracing
 from .routers import board, column, card
+from .services.board_purge import board_purger
+from .services.outbox import outbox_relay
+from .services.rebalancer import order_key_rebalancer
+from .services.sync_tombstones import sync_tombstone_pruner
 
 from .models import task as task_model
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    # Schema được quản lý bằng Alembic (alembic upgrade head trước khi chạy app)
+    outbox_relay.start()
+    board_purger.resume_pending()
+    sync_tombstone_pruner.start()
     yield
+    await outbox_relay.shutdown()
+    await sync_tombstone_pruner.shutdown()
+    board_purger.shutdown()
+    await board_event_hub.shutdown()
+    order_key_rebalancer.shutdown()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
 app = FastAPI(
     title="Task Service",
@@ -36,6 +53,28 @@ app.include_router(board.router, prefix="/api/v1")
 app.include_router(column.router, prefix="/api/v1")
 app.include_router(card.router, prefix="/api/v1")
 
+# --- TRACING (OpenTelemetry) ---
+setup_tracing(
+    app,
+    engines=[engine, async_engine.sync_engine]
+    + ([replica_engine.sync_engine] if replica_engine is not None else [])
+)
+
+# --- METRICS (Prometheus) ---
+# Latency theo route template; SQL timing và các metric cache / pool dùng chung registry mặc định
+Instrumentator(
+    should_group_status_codes=False,
+    should_ignore_untemplated=True,
+    should_instrument_requests_inprogress=True,
+    excluded_handlers=[
+        "/metrics",
+        "/health",
+        "/docs",
+        "/redoc",
+        "/openapi.json"
+    ]
+).instrument(app).expose(app)
+
 
 # --- SYSTEM API ---
 @app.get("/health", tags=["System"])
@@ -2,15 +2,20 @@
 import enum
 
 from sqlalchemy import Column as SqlColumn, Integer, DateTime, func, Table, ForeignKey, String, Boolean, Enum as DbEnum, \
-    Float
-from sqlalchemy.orm import relationship
+    Index, text, Computed, BigInteger
+from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB
+from sqlalchemy.orm import relationship, deferred
 
 from . import Base
 
 class BoardMember(Base):
     __tablename__ = "board_members"
+    __table_args__ = (
+        # "Board của tôi": tìm board theo user, index-only scan
+        Index("ix_board_members_user_id_board_id", "user_id", "board_id"),
+    )
 
-    board_id = SqlColumn(Integer, ForeignKey("boards.id"), primary_key=True)
+    board_id = SqlColumn(Integer, ForeignKey("boards.id", ondelete="CASCADE"), primary_key=True)
     user_id = SqlColumn(Integer, primary_key=True)
 
     role = SqlColumn(String, default="member")
@@ -21,8 +26,11 @@ class BoardMember(Base):
 
 class CardAssignment(Base):
     __tablename__ = "card_assignments"
+    __table_args__ = (
+        Index("ix_card_assignments_user_id_card_id", "user_id", "card_id"),
+    )
 
-    card_id = SqlColumn(Integer, ForeignKey("cards.id"), primary_key=True)
+    card_id = SqlColumn(Integer, ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True)
     user_id = SqlColumn(Integer, primary_key=True)
 
     role = SqlColumn(String, default="assignee")
@@ -34,8 +42,9 @@ class CardAssignment(Base):
 card_labels = Table(
     "card_labels",
     Base.metadata,
-    SqlColumn("card_id", Integer, ForeignKey("cards.id"), primary_key=True),
-    SqlColumn("label_id", Integer, ForeignKey("labels.id"), primary_key=True)
+    SqlColumn("card_id", Integer, ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True),
+    SqlColumn("label_id", Integer, ForeignKey("labels.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_card_labels_label_id_card_id", "label_id", "card_id")
 )
 
 
@@ -60,61 +69,149 @@ class Board(Base):
     background = SqlColumn(String, nullable=True)
 
     is_closed = SqlColumn(Boolean, default=False)
+    # Đã yêu cầu xoá vĩnh viễn, đang được BoardPurger xoá dần (services/board_purge.py)
+    purge_requested_at = SqlColumn(DateTime(timezone=True), nullable=True)
+
+    # Tăng mỗi khi nội dung board (column/card) thay đổi - dùng làm khoá cache & ETag
+    version = SqlColumn(Integer, nullable=False, default=0, server_default="0")
 
     created_at = SqlColumn(DateTime(timezone=True), server_default=func.now())
     updated_at = SqlColumn(DateTime(timezone=True), onupdate=func.now())
 
-    columns = relationship("Column", back_populates="board", cascade="all, delete-orphan")
+    # passive_deletes: con được xoá bởi ON DELETE CASCADE của DB, ORM không load từng dòng để xoá
+    columns = relationship("Column", back_populates="board", cascade="all, delete-orphan", passive_deletes=True)
 
-    labels = relationship("Label", back_populates="board", cascade="all, delete-orphan")
-    members = relationship("BoardMember", back_populates="board", cascade="all, delete-orphan")
+    labels = relationship("Label", back_populates="board", cascade="all, delete-orphan", passive_deletes=True)
+    members = relationship("BoardMember", back_populates="board", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Label(Base):
     __tablename__ = "labels"
+    __table_args__ = (
+        # Tra label theo board, và ON DELETE CASCADE khi xoá board
+        Index("ix_labels_board_id", "board_id"),
+    )
 
     id = SqlColumn(Integer, primary_key=True, index=True)
     title = SqlColumn(String, nullable=True)
     color = SqlColumn(String, nullable=False)
 
-    board_id = SqlColumn(Integer, ForeignKey("boards.id"))
+    board_id = SqlColumn(Integer, ForeignKey("boards.id", ondelete="CASCADE"))
     board = relationship("Board", back_populates="labels")
-    cards = relationship("Card", secondary=card_labels, back_populates="labels")
+    cards = relationship("Card", secondary=card_labels, back_populates="labels", passive_deletes=True)
 
 
 class Column(Base):
     __tablename__ = "columns"
+    __table_args__ = (
+        Index("ix_columns_board_id_position", "board_id", "position"),
+        Index("ix_columns_board_id_sync_version", "board_id", "sync_version"),
+    )
 
     id = SqlColumn(Integer, primary_key=True, index=True)
     title = SqlColumn(String, nullable=False)
-    position = SqlColumn(Float, nullable=False, default=0.0)
+    # Fractional index key (xem services/fractional_index.py), so sánh theo byte
+    position = SqlColumn(String(collation="C"), nullable=False)
 
     is_archived = SqlColumn(Boolean, default=False)
 
-    board_id = SqlColumn(Integer, ForeignKey("boards.id"), index=True)
+    board_id = SqlColumn(Integer, ForeignKey("boards.id", ondelete="CASCADE"))
     board = relationship("Board", back_populates="columns")
 
+    # Board.version tại lần ghi cuối, do trigger DB gán (xem migration 0006) - dùng cho delta sync
+    sync_version = SqlColumn(Integer, nullable=False, server_default="0")
+
     created_at = SqlColumn(DateTime(timezone=True), server_default=func.now())
     updated_at = SqlColumn(DateTime(timezone=True), onupdate=func.now())
 
-    cards = relationship("Card", back_populates="column", cascade="all, delete-orphan", order_by="Card.position")
+    cards = relationship(
+        "Card", back_populates="column", cascade="all, delete-orphan", order_by="Card.position", passive_deletes=True
+    )
+
+
+CARD_SEARCH_CONFIG = "simple"
+CARD_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{CARD_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{CARD_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
 
 
 class Card(Base):
     __tablename__ = "cards"
+    __table_args__ = (
+        # Key cuối của column (kể cả card đã archive) khi thêm / chuyển card
+        Index("ix_cards_column_id_position", "column_id", "position"),
+        # Danh sách card đang hoạt động theo thứ tự, keyset (position, id)
+        Index(
+            "ix_cards_active_column_id_position",
+            "column_id", "position", "id",
+            postgresql_where=text("NOT is_archived")
+        ),
+        Index("ix_cards_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_cards_column_id_sync_version", "column_id", "sync_version"),
+    )
 
     id = SqlColumn(Integer, primary_key=True, index=True)
     title = SqlColumn(String, nullable=False)
     description = SqlColumn(String, nullable=True)
-    position = SqlColumn(Float, nullable=False, default=0.0)
+    # Fractional index key (xem services/fractional_index.py), so sánh theo byte
+    position = SqlColumn(String(collation="C"), nullable=False)
 
     is_archived = SqlColumn(Boolean, default=False)
 
-    column_id = SqlColumn(Integer, ForeignKey("columns.id"), index=True)
+    column_id = SqlColumn(Integer, ForeignKey("columns.id", ondelete="CASCADE"))
     column = relationship("Column", back_populates="cards")
 
+    # Full-text search trên title (trọng số A) và description (B), Postgres tự tính khi ghi.
+    # Config 'simple' vì nội dung đa ngôn ngữ (không stemming); deferred để không load theo card.
+    search_vector = deferred(SqlColumn(
+        TSVECTOR,
+        Computed(CARD_SEARCH_VECTOR_SQL, persisted=True)
+    ))
+
+    # Board.version tại lần ghi cuối, do trigger DB gán (xem migration 0006) - dùng cho delta sync
+    sync_version = SqlColumn(Integer, nullable=False, server_default="0")
+
     created_at = SqlColumn(DateTime(timezone=True), server_default=func.now())
     updated_at = SqlColumn(DateTime(timezone=True), onupdate=func.now())
 
-    labels = relationship("Label", secondary=card_labels, back_populates="cards")
-    assignments = relationship("CardAssignment", back_populates="card", cascade="all, delete-orphan")
\ No newline at end of file
+    labels = relationship("Label", secondary=card_labels, back_populates="cards", passive_deletes=True)
+    assignments = relationship("CardAssignment", back_populates="card", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class SyncTombstone(Base):
+    """
+    Card / column đã bị xoá (hoặc card đã chuyển sang board khác), ghi bởi trigger DB,
+    để GET /boards/{id}/changes báo client bỏ chúng đi. Chỉ giữ cho các version gần nhất
+    của board (app/services/sync_tombstones.py).
+    """
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_board_id_version", "board_id", "version"),
+    )
+
+    id = SqlColumn(BigInteger, primary_key=True)
+    board_id = SqlColumn(Integer, nullable=False)
+    entity = SqlColumn(String, nullable=False)  # "card" | "column"
+    entity_id = SqlColumn(Integer, nullable=False)
+    version = SqlColumn(Integer, nullable=False)
+    deleted_at = SqlColumn(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class OutboxEvent(Base):
+    """
+    Domain event chờ publish lên Kafka (transactional outbox): ghi cùng transaction
+    với thay đổi, relay (services/outbox.py) đọc theo id, publish rồi xoá.
+    Không có FK tới boards: event board.deleted vẫn phải được gửi sau khi board bị xoá.
+    """
+    __tablename__ = "outbox_events"
+
+    id = SqlColumn(BigInteger, primary_key=True)
+    board_id = SqlColumn(Integer, nullable=False)
+    event_type = SqlColumn(String, nullable=False)
+    actor_id = SqlColumn(Integer, nullable=True)
+    payload = SqlColumn(JSONB, nullable=False)
+    # traceparent của request ghi event, để consumer nối tiếp trace
+    trace_context = SqlColumn(JSONB, nullable=True)
+
+    created_at = SqlColumn(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,70 +1,222 @@
-from typing import List
-from fastapi import APIRouter, status, Query
+from typing import List, Annotated, Optional, Literal
+from fastapi import APIRouter, status, Query, Header, Response, UploadFile, HTTPException
+from fastapi.responses import StreamingResponse
+from loguru import logger
 
-from ..schemas.board import BoardResponse, BoardCreate, BoardDetailResponse, BoardMemberResponse, BoardMemberCreate
+from ..core.realtime import board_event_hub
+from ..schemas.board import BoardResponse, BoardCreate, BoardDetailResponse, BoardMemberResponse, BoardMemberCreate, \
+    BoardImportResponse, BoardChangesResponse, BoardCloneRequest
+from ..schemas.pagination import CursorPage
 from ..services.board_service import BoardService
-from ..api.deps import SessionDep, CurrentUser
+from ..services.export_service import stream_board_ndjson
+from ..services.import_service import BoardImportService
+from ..services.permissions import get_board_role
+from ..api.deps import SessionDep, SyncSessionDep, CurrentUser
 
 
 router = APIRouter(prefix="/boards", tags=["Boards"])
 
 @router.post("/", response_model=BoardResponse, status_code=status.HTTP_201_CREATED)
-def create_board(
+async def create_board(
     board_data: BoardCreate, 
     db: SessionDep, 
     current_user: CurrentUser
 ):
-    return BoardService(db).create(board_data, user_id=current_user.id)
+    return await BoardService(db).create(board_data, user_id=current_user.id)
 
 
-@router.get("/", response_model=List[BoardResponse])
-def get_my_boards(
+@router.post("/import", response_model=BoardImportResponse, status_code=status.HTTP_201_CREATED)
+def import_board(
+    file: UploadFile,
+    db: SyncSessionDep,
+    current_user: CurrentUser,
+    format: Optional[Literal["trello", "csv"]] = Query(None, description="Defaults to the file extension"),
+    title: Optional[str] = Query(None, description="Override the imported board title")
+):
+    """
+    Import a board from a Trello JSON export or a CSV file.
+
+    The upload is parsed incrementally and cards are written in batches,
+    so memory use does not grow with the card data (Trello imports keep only
+    each card's `pos` and id, to apply Trello's card order at the end).
+    """
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "trello")
+    service = BoardImportService(
+        db,
+        progress=lambda count: logger.info(f"Import by user {current_user.id}: {count} cards written")
+    )
+    return service.import_file(file.file, fmt, owner_id=current_user.id, title=title)
+
+
+@router.post("/{board_id}/clone", response_model=BoardResponse, status_code=status.HTTP_201_CREATED)
+async def clone_board(
+    board_id: int,
+    db: SessionDep,
+    current_user: CurrentUser,
+    clone_data: Optional[BoardCloneRequest] = None
+):
+    """
+    Create a new board owned by you with a copy of the board's active columns, cards,
+    labels and card labels (and, optionally, card assignments together with the assignees'
+    membership). The copy runs in a single SQL statement inside the database.
+    """
+    return await BoardService(db).clone(board_id, clone_data or BoardCloneRequest(), user_id=current_user.id)
+
+
+@router.get("/", response_model=CursorPage[BoardResponse])
+async def get_my_boards(
     db: SessionDep, 
     current_user: CurrentUser, 
-    skip: int = 0, 
-    limit: int = 100
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(100, ge=1, le=500)
 ):
-    return BoardService(db).get_my_boards(user_id=current_user.id, skip=skip, limit=limit)
+    return await BoardService(db).get_my_boards(user_id=current_user.id, cursor=cursor, limit=limit)
 
 
-@router.get("/{board_id}", response_model=BoardDetailResponse)
-def get_board_details(
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get(
+    "/{board_id}",
+    response_model=BoardDetailResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Board has not changed since the given ETag"}}
+)
+async def get_board_details(
     board_id: int, 
     db: SessionDep, 
+    current_user: CurrentUser,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    fields: Optional[str] = Query(
+        None, description="Card fields to include, comma separated (`id` and `column_id` are always included). "
+                          "Defaults to every field except `description`: fetch it with `GET /cards/{card_id}`"
+    )
+):
+    if await get_board_role(db, board_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Board not found or access denied")
+
+    service = BoardService(db)
+    card_fields = service.snapshot_card_fields(fields)
+    version = await service.get_board_version(board_id)
+    etag = service.snapshot_etag(board_id, version, card_fields)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = await service.get_board_snapshot(board_id, version, card_fields)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{board_id}/changes", response_model=BoardChangesResponse)
+async def get_board_changes(
+    board_id: int,
+    db: SessionDep,
+    current_user: CurrentUser,
+    since: int = Query(..., ge=0, description="Board version the client already has (the number in the ETag)")
+):
+    """
+    Columns and cards created, updated, archived or deleted since `since`.
+
+    Apply deletions, then upsert `columns` and `cards`, and send `version` as `since`
+    next time. When `reset` is true the delta is unavailable or larger than the board:
+    reload it with `GET /boards/{board_id}`.
+    """
+    return await BoardService(db).get_changes(board_id, since=since, user_id=current_user.id)
+
+
+@router.get("/{board_id}/export", response_class=StreamingResponse)
+async def export_board(
+    board_id: int,
+    db: SessionDep,
+    current_user: CurrentUser
+):
+    """
+    Stream the whole board (columns, cards, labels, assignments) as NDJSON.
+
+    Rows are read through a server-side cursor, so memory stays flat
+    regardless of board size.
+    """
+    if await get_board_role(db, board_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Board not found or access denied")
+
+    # Export đọc trên connection riêng: trả connection của request về pool trước khi stream,
+    # để client chậm không giữ hai connection trong suốt quá trình tải
+    await db.close()
+
+    return StreamingResponse(
+        stream_board_ndjson(board_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="board-{board_id}.ndjson"'}
+    )
+
+
+@router.get("/{board_id}/events", response_class=StreamingResponse)
+async def board_events(
+    board_id: int,
+    db: SessionDep,
     current_user: CurrentUser
 ):
-    return BoardService(db).get_board_detail(board_id, user_id=current_user.id) 
+    """
+    Server-Sent Events stream of changes to the board, pushed right after each commit.
+
+    Each event has the outbox event id as `id`, the event type (e.g. `card.moved`) as
+    `event`, and a JSON body. A `resync` event means the client fell behind and should
+    reload the board (`GET /boards/{board_id}` with its ETag).
+    """
+    if await get_board_role(db, board_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Board not found or access denied")
+
+    # Stream có thể mở hàng giờ: trả connection về pool ngay, không giữ trong suốt stream
+    await db.close()
+
+    return StreamingResponse(
+        board_event_hub.stream(board_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # 4. XÓA / ĐÓNG BẢNG (DELETE)
-@router.delete("/{board_id}", response_model=dict)
-def delete_board(
+@router.delete(
+    "/{board_id}",
+    response_model=dict,
+    responses={status.HTTP_202_ACCEPTED: {"description": "Permanent deletion scheduled, data is purged in the background"}}
+)
+async def delete_board(
     board_id: int,
+    response: Response,
     db: SessionDep,
     current_user: CurrentUser,
     permanent: bool = Query(False)
 ):
-    return BoardService(db).delete_board(
+    result = await BoardService(db).delete_board(
         board_id=board_id, 
         user_id=current_user.id, 
         permanent=permanent
     )
+    if permanent:
+        response.status_code = status.HTTP_202_ACCEPTED
+    return result
 
 
 @router.post("/{board_id}/members", response_model=BoardMemberResponse)
-def add_board_member(
+async def add_board_member(
     board_id: int,
     member_data: BoardMemberCreate,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return BoardService(db).add_member(board_id, member_data, current_user.id)
+    return await BoardService(db).add_member(board_id, member_data, current_user.id)
 
 
 @router.get("/{board_id}/members", response_model=List[BoardMemberResponse])
-def get_board_members(
+async def get_board_members(
     board_id: int,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return BoardService(db).get_board_members(board_id, current_user.id)
\ No newline at end of file
+    return await BoardService(db).get_board_members(board_id, current_user.id)
\ No newline at end of file
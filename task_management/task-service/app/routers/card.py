@@ -1,70 +1,125 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter
 from fastapi.params import Query
 from starlette import status
 
-from ..schemas.card import CardResponse, CardCreate, CardUpdate, CardAssignmentCreate, CardAssignmentResponse
+from ..schemas.card import CardResponse, CardCreate, CardUpdate, CardAssignmentCreate, CardAssignmentResponse, \
+    CardBulkRequest, CardBulkResult, CardSearchResult, AssignedCard, CardFieldsResponse
+from ..schemas.pagination import CursorPage
 from ..api.deps import SessionDep, CurrentUser
 from ..services.card_service import CardService
 
 router = APIRouter(prefix="/cards", tags=["Cards"])
 
-@router.get("/", response_model=list[CardResponse], status_code=status.HTTP_200_OK, description="Get all cards in a column")
-def get_cards_by_column(
+@router.get("/", response_model=CursorPage[CardFieldsResponse], response_model_exclude_unset=True, status_code=status.HTTP_200_OK, description="Get cards in a column, ordered by position")
+async def get_cards_by_column(
     column_id: int,
     db: SessionDep,
+    current_user: CurrentUser,
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Card fields to include, comma separated (`id` is always included). Defaults to all fields")
+):
+    return await CardService(db).get_cards_in_column(
+        user_id=current_user.id,
+        column_id=column_id,
+        cursor=cursor,
+        limit=limit,
+        fields=fields
+    )
+
+@router.get("/search", response_model=CursorPage[CardSearchResult], description="Full-text search cards on the boards you are a member of, most relevant first")
+async def search_cards(
+    db: SessionDep,
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (web search syntax: \"phrase\", -exclude, or)"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(50, ge=1, le=200)
+):
+    return await CardService(db).search(
+        user_id=current_user.id,
+        q=q,
+        cursor=cursor,
+        limit=limit
+    )
+
+@router.get("/assigned", response_model=CursorPage[AssignedCard], description="Active cards assigned to you across all your boards, newest first")
+async def get_assigned_cards(
+    db: SessionDep,
+    current_user: CurrentUser,
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(100, ge=1, le=500)
+):
+    return await CardService(db).get_assigned_cards(
+        user_id=current_user.id,
+        cursor=cursor,
+        limit=limit
+    )
+
+@router.get("/{card_id}", response_model=CardResponse, description="Get one card with all its fields, including `description`")
+async def get_card(
+    card_id: int,
+    db: SessionDep,
     current_user: CurrentUser
 ):
-    return CardService(db).get_cards_in_column(user_id=current_user.id, column_id=column_id)
+    return await CardService(db).get_card(card_id, user_id=current_user.id)
 
 @router.post("/", response_model=CardResponse, status_code=status.HTTP_200_OK)
-def create_card(
+async def create_card(
     card_data: CardCreate,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return CardService(db).create(card_data, user_id=current_user.id)
+    return await CardService(db).create(card_data, user_id=current_user.id)
+
+@router.post("/bulk", response_model=List[CardBulkResult], description="Apply many card updates/moves in one transaction")
+async def bulk_update_cards(
+    bulk_data: CardBulkRequest,
+    db: SessionDep,
+    current_user: CurrentUser
+):
+    return await CardService(db).bulk_update(bulk_data.items, current_user.id)
 
 @router.patch("/{card_id}", response_model=CardResponse)
-def update_card(
+async def update_card(
     card_id: int,
     data_update: CardUpdate,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return CardService(db).update(card_id, data_update, current_user.id)
+    return await CardService(db).update(card_id, data_update, current_user.id)
 
 @router.delete("/{card_id}", response_model=dict)
-def delete_card(
+async def delete_card(
     card_id: int,
     db: SessionDep,
     current_user: CurrentUser,
     permanent: bool = Query(False)
 ):
-    return CardService(db).delete(card_id, current_user.id, permanent)
+    return await CardService(db).delete(card_id, current_user.id, permanent)
 
 @router.post("/{card_id}/unarchived", response_model=CardResponse)
-def unarchived_column(
+async def unarchived_column(
         card_id: int,
         db: SessionDep,
         current_user: CurrentUser
 ):
-    return CardService(db).unarchived_card(card_id, user_id=current_user.id)
+    return await CardService(db).unarchived_card(card_id, user_id=current_user.id)
 
 @router.post("/{card_id}/assignees", response_model=CardAssignmentResponse)
-def add_card_assignee(
+async def add_card_assignee(
     card_id: int,
     assignment_data: CardAssignmentCreate,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return CardService(db).add_assignee(card_id, assignment_data, current_user.id)
+    return await CardService(db).add_assignee(card_id, assignment_data, current_user.id)
 
 @router.get("/{card_id}/assignees", response_model=List[CardAssignmentResponse])
-def get_card_assignees(
+async def get_card_assignees(
         card_id: int,
         db: SessionDep,
         current_user: CurrentUser
 ):
-    return CardService(db).get_card_assignees(card_id, current_user.id)
\ No newline at end of file
+    return await CardService(db).get_card_assignees(card_id, current_user.id)
\ No newline at end of file
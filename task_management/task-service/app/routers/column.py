@@ -1,67 +1,73 @@
+from typing import List, Optional
+
 from fastapi import APIRouter
 from fastapi.params import Query
 from starlette import status
-from ..schemas.column import ColumnResponse, ColumnCreate
+from ..schemas.column import ColumnResponse, ColumnCreate, ColumnCardsResponse
 from ..api.deps import SessionDep, CurrentUser
 from ..services.column_service import ColumnService, ColumnUpdate
-from typing import List
 
 router = APIRouter(prefix="/columns", tags=["Columns"])
 
-@router.get("/", response_model=List[ColumnResponse], status_code=status.HTTP_200_OK)
-def get_columns(
+@router.get("/", response_model=List[ColumnCardsResponse], response_model_exclude_unset=True, status_code=status.HTTP_200_OK)
+async def get_columns(
     board_id: int,
     db: SessionDep,
     current_user: CurrentUser,
-    include_archived: bool = Query(False, description="Include archived columns in the result")
+    include_archived: bool = Query(False, description="Include archived columns in the result"),
+    fields: Optional[str] = Query(
+        None, description="Card fields to include, comma separated (`id` and `column_id` are always included). "
+                          "Defaults to every field except `description`: fetch it with `GET /cards/{card_id}`"
+    )
 ):
     """
     Retrieve all columns for a specific board.
     
-    Fetch list of columns belonging to the `board_id`.
+    Fetch list of columns belonging to the `board_id`, each with its active (not archived) cards.
     
     **Sorting:**
-    - Ordered by `position` (ascending).
+    - Ordered by `position` (ascending), cards too.
     
     **Access Control:**
     - User must be a member of the Board.
     """
-    return ColumnService(db).get_columns_by_board(
+    return await ColumnService(db).get_columns_by_board(
         user_id=current_user.id, 
         board_id=board_id, 
-        include_archived=include_archived
+        include_archived=include_archived,
+        fields=fields
     )
 
 @router.post("/", response_model=ColumnResponse, status_code=status.HTTP_201_CREATED)
-def create_column(
+async def create_column(
     column_data: ColumnCreate,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return ColumnService(db).create_column(column_data, user_id=current_user.id)
+    return await ColumnService(db).create_column(column_data, user_id=current_user.id)
 
 @router.patch("/{column_id}", response_model=ColumnResponse)
-def update_column(
+async def update_column(
     column_id: int,
     column_data: ColumnUpdate,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return ColumnService(db).update_column(column_id, column_data, user_id=current_user.id)
+    return await ColumnService(db).update_column(column_id, column_data, user_id=current_user.id)
 
 @router.delete("/{column_id}", response_model=dict)
-def delete_column(
+async def delete_column(
     column_id: int,
     db: SessionDep,
     current_user: CurrentUser,
     permanent: bool = Query(False)
 ):
-    return ColumnService(db).delete_column(column_id, current_user.id, permanent)
+    return await ColumnService(db).delete_column(column_id, current_user.id, permanent)
 
 @router.post("/{column_id}/unarchived", response_model=ColumnResponse)
-def unarchived_column(
+async def unarchived_column(
     column_id: int,
     db: SessionDep,
     current_user: CurrentUser
 ):
-    return ColumnService(db).unarchived_column(column_id, user_id=current_user.id)
\ No newline at end of file
+    return await ColumnService(db).unarchived_column(column_id, user_id=current_user.id)
\ No newline at end of file
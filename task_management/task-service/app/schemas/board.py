@@ -2,7 +2,8 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel
 from ..models.task import BoardVisibility
-from .column import ColumnResponse
+from .card import CardResponse
+from .column import ColumnResponse, ColumnChange
 
 class BoardBase(BaseModel):
     title: str
@@ -29,6 +30,24 @@ class BoardDetailResponse(BoardResponse):
     columns: List[ColumnResponse] = []
 
 
+# Input - sao chép board (POST /boards/{id}/clone)
+class BoardCloneRequest(BaseModel):
+    # Mặc định: "<title cũ> (copy)"
+    title: Optional[str] = None
+    include_assignments: bool = False
+
+
+# Output - GET /boards/{id}/changes
+class BoardChangesResponse(BaseModel):
+    version: int
+    # True: client phải tải lại cả board (GET /boards/{id}) thay vì áp dụng delta
+    reset: bool = False
+    columns: List[ColumnChange] = []
+    cards: List[CardResponse] = []
+    deleted_column_ids: List[int] = []
+    deleted_card_ids: List[int] = []
+
+
 # Input
 class BoardMemberCreate(BaseModel):
     user_id: int
@@ -41,4 +60,12 @@ class BoardMemberResponse(BaseModel):
     joined_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Output - kết quả import board
+class BoardImportResponse(BaseModel):
+    board_id: int
+    columns: int
+    cards: int
+    labels: int
+    assignments: int
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 from pydantic import BaseModel, Field
 
@@ -17,7 +17,7 @@ class CardCreate(CardBase):
 class CardResponse(CardBase):
     id: int
     column_id: int
-    position: int
+    position: str
     is_archived: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -25,13 +25,48 @@ class CardResponse(CardBase):
     class Config:
         from_attributes = True
 
+# Output - card trong GET /cards/?fields=..., chỉ gồm các field được chọn (id luôn có)
+class CardFieldsResponse(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    id: int
+    column_id: Optional[int] = None
+    position: Optional[str] = None
+    is_archived: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+# Field dùng được trong `?fields=`, theo thứ tự của CardResponse
+CARD_FIELDS = tuple(CardResponse.model_fields)
+# Board view chỉ hiện title: description (có thể hàng chục KB) lấy riêng qua GET /cards/{id}
+BOARD_CARD_FIELDS = tuple(name for name in CARD_FIELDS if name != "description")
+
+# Output - một kết quả của /cards/search
+class CardSearchResult(BaseModel):
+    card: CardResponse
+    board_id: int
+    rank: float
+
+# Output - một card trong /cards/assigned
+class AssignedCard(BaseModel):
+    card: CardResponse
+    board_id: int
+    board_title: str
+    column_title: str
+
 # Input
 class CardUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    new_index: Optional[int] = None
+    # Deprecated: phải đếm qua new_index phần tử (O(new_index)), chỉ giữ cho client cũ
+    new_index: Optional[int] = Field(
+        None, json_schema_extra={"deprecated": True},
+        description="Deprecated, cost grows with the index: send `after_id` / `before_id` instead"
+    )
+    # Cách di chuyển được hỗ trợ: neo theo card bên cạnh ở vị trí đích, 2 truy vấn index (O(log n))
+    after_id: Optional[int] = Field(None, description="Place right after this card (takes precedence over `new_index`)")
+    before_id: Optional[int] = Field(None, description="Place right before this card (takes precedence over `new_index`)")
     column_id: Optional[int] = None
-    position: Optional[float] = None
 
 # Input
 class CardAssignmentCreate(BaseModel):
@@ -45,4 +80,26 @@ class CardAssignmentResponse(BaseModel):
     assigned_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Input - một thao tác trong POST /cards/bulk
+class CardBulkItem(BaseModel):
+    card_id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    is_archived: Optional[bool] = None
+    # Chuyển card sang column khác, thêm vào cuối column theo thứ tự trong request
+    column_id: Optional[int] = None
+    # Thay toàn bộ label của card (label phải thuộc cùng board)
+    label_ids: Optional[List[int]] = None
+
+# Input
+class CardBulkRequest(BaseModel):
+    items: List[CardBulkItem] = Field(..., min_length=1, max_length=1000)
+
+# Output
+class CardBulkResult(BaseModel):
+    card_id: int
+    ok: bool
+    error: Optional[str] = None
+    card: Optional[CardResponse] = None
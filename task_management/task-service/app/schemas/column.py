@@ -2,13 +2,13 @@ from datetime import datetime
 from typing import Optional, List
 
 from pydantic import BaseModel, Field
-from .card import CardResponse
+from .card import CardResponse, CardFieldsResponse
 
 
 # Output
 class ColumnBase(BaseModel):
     title: str
-    position: int
+    position: str
 
 # Output
 class ColumnResponse(ColumnBase):
@@ -20,6 +20,24 @@ class ColumnResponse(ColumnBase):
     class Config:
         from_attributes = True
 
+# Output - column trong GET /columns/?fields=..., card chỉ gồm các field được chọn
+class ColumnCardsResponse(ColumnBase):
+    id: int
+    created_at: datetime
+
+    cards: List[CardFieldsResponse]
+
+# Output - column trong delta sync, không kèm card
+class ColumnChange(ColumnBase):
+    id: int
+    board_id: int
+    is_archived: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 # Input
 class ColumnCreate(BaseModel):
     title: str
@@ -28,5 +46,11 @@ class ColumnCreate(BaseModel):
 # Input - schema update title và thay đổi vị trí column
 class ColumnUpdate(BaseModel):
     title: Optional[str] = None
-    new_index: Optional[int] = None
-    position: Optional[float] = None
+    # Deprecated: phải đếm qua new_index phần tử (O(new_index)), chỉ giữ cho client cũ
+    new_index: Optional[int] = Field(
+        None, json_schema_extra={"deprecated": True},
+        description="Deprecated, cost grows with the index: send `after_id` / `before_id` instead"
+    )
+    # Cách di chuyển được hỗ trợ: neo theo column bên cạnh ở vị trí đích, 2 truy vấn index (O(log n))
+    after_id: Optional[int] = Field(None, description="Place right after this column (takes precedence over `new_index`)")
+    before_id: Optional[int] = Field(None, description="Place right before this column (takes precedence over `new_index`)")
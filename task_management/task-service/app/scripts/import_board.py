@@ -0,0 +1,47 @@
+# task_management/task-service/app/scripts/import_board.py
+#
+# Import board từ dòng lệnh:
+#   python -m app.scripts.import_board board.json --owner-id 1
+#   python -m app.scripts.import_board cards.csv --owner-id 1 --title "Sprint 12"
+
+import argparse
+import sys
+import time
+
+from ..db import SessionLocal
+from ..services.import_service import BoardImportService, IMPORT_BATCH_SIZE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import a board from a Trello JSON export or a CSV file")
+    parser.add_argument("path", help="Path to the .json or .csv file")
+    parser.add_argument("--owner-id", type=int, required=True, help="User id that will own the board")
+    parser.add_argument("--format", choices=["trello", "csv"], help="Defaults to the file extension")
+    parser.add_argument("--title", help="Override the imported board title")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "trello")
+    started = time.monotonic()
+
+    def report(count: int) -> None:
+        elapsed = time.monotonic() - started
+        print(f"\r{count} cards imported ({count / max(elapsed, 1e-6):.0f}/s)", end="", file=sys.stderr, flush=True)
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as fileobj:
+            result = BoardImportService(db, batch_size=args.batch_size, progress=report).import_file(
+                fileobj, fmt, owner_id=args.owner_id, title=args.title
+            )
+    finally:
+        db.close()
+
+    print(file=sys.stderr)
+    print(f"Imported board {result['board_id']}: {result['columns']} columns, {result['cards']} cards, "
+          f"{result['labels']} labels, {result['assignments']} assignments "
+          f"in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
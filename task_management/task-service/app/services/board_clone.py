@@ -0,0 +1,106 @@
+from sqlalchemy import Boolean, Integer, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.tracing import traced
+
+# Sao chép nội dung board trong MỘT câu lệnh: các CTE *_map cấp id mới bằng nextval
+# (MATERIALIZED: mỗi id cũ chỉ được cấp một id mới), các CTE INSERT ... SELECT dùng
+# map đó để nối lại column_id / card_id / label_id. Không có dòng nào đi qua ORM.
+# Card / column đã archive không được sao chép.
+_CLONE_SQL = text("""
+WITH
+column_map AS MATERIALIZED (
+    SELECT id AS old_id, nextval(pg_get_serial_sequence('columns', 'id'))::integer AS new_id
+    FROM columns
+    WHERE board_id = :source_id AND NOT coalesce(is_archived, false)
+),
+label_map AS MATERIALIZED (
+    SELECT id AS old_id, nextval(pg_get_serial_sequence('labels', 'id'))::integer AS new_id
+    FROM labels
+    WHERE board_id = :source_id
+),
+card_map AS MATERIALIZED (
+    SELECT c.id AS old_id, nextval(pg_get_serial_sequence('cards', 'id'))::integer AS new_id,
+           m.new_id AS new_column_id
+    FROM cards c
+    JOIN column_map m ON m.old_id = c.column_id
+    WHERE NOT coalesce(c.is_archived, false)
+),
+new_columns AS (
+    INSERT INTO columns (id, title, position, is_archived, board_id)
+    SELECT m.new_id, c.title, c.position, false, :target_id
+    FROM columns c
+    JOIN column_map m ON m.old_id = c.id
+),
+new_labels AS (
+    INSERT INTO labels (id, title, color, board_id)
+    SELECT m.new_id, l.title, l.color, :target_id
+    FROM labels l
+    JOIN label_map m ON m.old_id = l.id
+),
+new_cards AS (
+    INSERT INTO cards (id, title, description, position, is_archived, column_id)
+    SELECT m.new_id, c.title, c.description, c.position, false, m.new_column_id
+    FROM cards c
+    JOIN card_map m ON m.old_id = c.id
+),
+new_card_labels AS (
+    INSERT INTO card_labels (card_id, label_id)
+    SELECT cm.new_id, lm.new_id
+    FROM card_labels cl
+    JOIN card_map cm ON cm.old_id = cl.card_id
+    JOIN label_map lm ON lm.old_id = cl.label_id
+),
+-- Người được giao phải là member của board: thêm họ vào board mới với role cũ
+assignees AS MATERIALIZED (
+    SELECT DISTINCT bm.user_id, bm.role
+    FROM card_assignments a
+    JOIN card_map cm ON cm.old_id = a.card_id
+    JOIN board_members bm ON bm.board_id = :source_id AND bm.user_id = a.user_id
+    WHERE :include_assignments
+),
+new_members AS (
+    INSERT INTO board_members (board_id, user_id, role)
+    SELECT :target_id, user_id, role
+    FROM assignees
+    WHERE user_id <> :user_id
+),
+new_assignments AS (
+    INSERT INTO card_assignments (card_id, user_id, role)
+    SELECT cm.new_id, a.user_id, a.role
+    FROM card_assignments a
+    JOIN card_map cm ON cm.old_id = a.card_id
+    JOIN assignees s ON s.user_id = a.user_id
+)
+SELECT
+    (SELECT count(*) FROM column_map) AS columns,
+    (SELECT count(*) FROM card_map) AS cards,
+    (SELECT count(*) FROM label_map) AS labels,
+    (SELECT count(*) FROM assignees) AS assignees
+""").bindparams(
+    bindparam("source_id", type_=Integer),
+    bindparam("target_id", type_=Integer),
+    bindparam("user_id", type_=Integer),
+    bindparam("include_assignments", type_=Boolean),
+)
+
+
+@traced("board_clone.copy_board_content")
+async def copy_board_content(
+    db: AsyncSession,
+    source_id: int,
+    target_id: int,
+    user_id: int,
+    include_assignments: bool = False
+) -> dict:
+    """
+    Sao chép column, card, label, card_labels (và tuỳ chọn assignment) của board nguồn
+    sang board đích đã tồn tại, trong transaction hiện tại. Trả về số dòng đã sao chép.
+    """
+    row = (await db.execute(_CLONE_SQL, {
+        "source_id": source_id,
+        "target_id": target_id,
+        "user_id": user_id,
+        "include_assignments": include_assignments,
+    })).one()
+    return dict(row._mapping)
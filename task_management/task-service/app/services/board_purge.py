@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.metrics import current_operation
+from ..db import SessionLocal
+from ..models.task import Board, Card, Column
+
+
+def purge_card_chunk(db: Session, board_id: int, chunk_size: int) -> int:
+    """Xoá tối đa `chunk_size` card của board (assignment, label của card xoá theo cascade)."""
+    card_ids = db.execute(
+        select(Card.id)
+        .join(Column, Card.column_id == Column.id)
+        .where(Column.board_id == board_id)
+        .limit(chunk_size)
+        .with_for_update(of=Card, skip_locked=True)
+    ).scalars().all()
+
+    if card_ids:
+        db.execute(delete(Card).where(Card.id.in_(card_ids)))
+    return len(card_ids)
+
+
+class BoardPurger:
+    """
+    Xoá vĩnh viễn board ở background thread, từng lô card một transaction, để không
+    giữ khoá lâu và không sinh một transaction khổng lồ với board rất lớn.
+    Board chờ xoá được đánh dấu purge_requested_at, nên job dang dở chạy tiếp sau khi restart.
+    """
+
+    def __init__(self, chunk_size: int, pause_seconds: float):
+        self.chunk_size = chunk_size
+        self.pause_seconds = pause_seconds
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="board-purger")
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+
+    def schedule(self, board_id: int) -> None:
+        with self._lock:
+            if board_id in self._pending:
+                return
+            self._pending.add(board_id)
+        self._executor.submit(self._run, board_id)
+
+    def resume_pending(self) -> None:
+        """Lên lịch lại các board đã yêu cầu xoá nhưng chưa xoá xong (vd. process bị restart)."""
+        self._executor.submit(self._resume)
+
+    def _resume(self) -> None:
+        db = SessionLocal()
+        try:
+            board_ids = db.execute(
+                select(Board.id).where(Board.purge_requested_at.is_not(None))
+            ).scalars().all()
+        except Exception as e:
+            logger.error(f"Failed to load pending board purges: {e}")
+            return
+        finally:
+            db.close()
+
+        for board_id in board_ids:
+            self.schedule(board_id)
+
+    def _run(self, board_id: int) -> None:
+        current_operation.set("BoardPurger.purge")
+        db = SessionLocal()
+        deleted = 0
+        try:
+            while True:
+                count = purge_card_chunk(db, board_id, self.chunk_size)
+                db.commit()
+                if count == 0:
+                    break
+                deleted += count
+                time.sleep(self.pause_seconds)
+
+            # Phần còn lại (column, label, member) nhỏ: một câu DELETE, DB cascade
+            db.execute(delete(Board).where(Board.id == board_id))
+            db.commit()
+            logger.info(f"Purged board {board_id} ({deleted} cards)")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to purge board {board_id}, will retry on restart: {e}")
+        finally:
+            db.close()
+            with self._lock:
+                self._pending.discard(board_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+board_purger = BoardPurger(
+    chunk_size=settings.BOARD_PURGE_CHUNK_SIZE,
+    pause_seconds=settings.BOARD_PURGE_PAUSE_SECONDS,
+)
@@ -1,19 +1,37 @@
-from typing import List
+import hashlib
+from datetime import datetime
+from typing import List, Optional
 
 from fastapi import HTTPException
 from loguru import logger
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from ..schemas.board import BoardCreate, BoardMemberCreate
-from ..models.task import Board, BoardMember, BoardVisibility, Column
+from ..core.config import settings
+from ..core.metrics import instrument_service
+from ..core.acl_cache import acl_cache
+from ..core.cache import board_snapshot_cache, board_snapshot_flight
+from ..core.fields import parse_fields
+from ..core.pagination import encode_cursor, decode_cursor
+from ..db.routing import replica_read
+from ..schemas.board import BoardCreate, BoardMemberCreate, BoardCloneRequest
+from ..schemas.card import CARD_FIELDS, BOARD_CARD_FIELDS
+from ..models.task import Board, BoardMember, BoardVisibility, Column, Card, SyncTombstone
+from .board_clone import copy_board_content
+from .board_purge import board_purger
+from .board_snapshot import render_board_snapshot
+from .board_version import bump_board_version_async, lock_board_async
+from .outbox import record_event
+from .permissions import get_board_role
 
 
+@instrument_service
 class BoardService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, board_data: BoardCreate, user_id: int) -> Board:
+    async def create(self, board_data: BoardCreate, user_id: int) -> Board:
         new_board = Board(
             title = board_data.title,
             visibility = board_data.visibility,
@@ -23,7 +41,7 @@ class BoardService:
 
         try:
             self.db.add(new_board)
-            self.db.flush()
+            await self.db.flush()
 
             member = BoardMember(
                 board_id=new_board.id,
@@ -31,30 +49,88 @@ class BoardService:
                 role="admin"
             )
             self.db.add(member)
+            await record_event(
+                self.db, "board.created", new_board.id, user_id,
+                title=new_board.title, visibility=new_board.visibility.value, owner_id=user_id
+            )
 
-            self.db.commit()
-            self.db.refresh(new_board)
+            await self.db.commit()
+            await self.db.refresh(new_board)
             logger.info(f"User {user_id} created board {new_board.id}")
             return new_board
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error creating board: {e}")
             raise HTTPException(status_code=500, detail="Failed to create board")
 
-    def get_my_boards(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Board]:
+    async def clone(self, board_id: int, clone_data: BoardCloneRequest, user_id: int) -> Board:
+        """Tạo board mới (user là admin) với bản sao nội dung board nguồn, sao chép hoàn toàn trong DB."""
+        if await get_board_role(self.db, board_id, user_id) is None:
+            raise HTTPException(status_code=404, detail="Board not found or access denied")
+
+        source = await self.db.get(Board, board_id)
+        if source is None or source.purge_requested_at is not None:
+            raise HTTPException(status_code=404, detail="Board not found or access denied")
+
+        new_board = Board(
+            title=clone_data.title or f"{source.title} (copy)",
+            visibility=source.visibility,
+            background=source.background,
+            owner_id=user_id
+        )
+
         try:
-            return (
-                self.db.query(Board)
-                .join(BoardMember, Board.id == BoardMember.board_id)
-                .filter(
-                    BoardMember.user_id == user_id,
-                    Board.is_closed == False
-                )
-                .order_by(Board.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+            self.db.add(new_board)
+            await self.db.flush()
+            self.db.add(BoardMember(board_id=new_board.id, user_id=user_id, role="admin"))
+            await self.db.flush()
+
+            counts = await copy_board_content(
+                self.db,
+                source_id=board_id,
+                target_id=new_board.id,
+                user_id=user_id,
+                include_assignments=clone_data.include_assignments
+            )
+            await record_event(
+                self.db, "board.created", new_board.id, user_id,
+                title=new_board.title, visibility=new_board.visibility.value, owner_id=user_id,
+                source_board_id=board_id
             )
+
+            await self.db.commit()
+            await self.db.refresh(new_board)
+            logger.info(f"User {user_id} cloned board {board_id} into {new_board.id}: {counts}")
+            return new_board
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error cloning board {board_id}: {e}")
+            raise HTTPException(status_code=500, detail="Failed to clone board")
+
+    async def get_my_boards(self, user_id: int, cursor: Optional[str] = None, limit: int = 100) -> dict:
+        query = (
+            select(Board)
+            .join(BoardMember, Board.id == BoardMember.board_id)
+            .where(
+                BoardMember.user_id == user_id,
+                Board.is_closed == False
+            )
+        )
+
+        if cursor:
+            created_at, last_id = decode_cursor(cursor, size=2)
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+            query = query.where(tuple_(Board.created_at, Board.id) < tuple_(created_at, last_id))
+
+        try:
+            boards = (await self.db.scalars(
+                query
+                .order_by(Board.created_at.desc(), Board.id.desc())
+                .limit(limit + 1)
+            )).all()
         except Exception as e:
             logger.error(f"Error fetching boards for user {user_id}: {e}")
             raise HTTPException(
@@ -62,39 +138,142 @@ class BoardService:
                 detail="Failed to retrieve boards"
             )
 
-    def get_board_detail(self, board_id: int, user_id: int) -> Board:
-        
-        board = (
-            self.db.query(Board)
-            .options(
-                joinedload(Board.columns).joinedload(Column.cards)
-            )
-            .filter(Board.id == board_id)
-            .first()
-        )
+        next_cursor = None
+        if len(boards) > limit:
+            boards = boards[:limit]
+            next_cursor = encode_cursor(boards[-1].created_at.isoformat(), boards[-1].id)
+        return {"items": boards, "next_cursor": next_cursor}
 
-        if not board:
+    @replica_read
+    async def render_board_detail(self, board_id: int, card_fields: tuple[str, ...] = BOARD_CARD_FIELDS) -> bytes:
+        body = await render_board_snapshot(self.db, board_id, card_fields)
+        if body is None:
             raise HTTPException(status_code=404, detail="Board not found")
+        return body
 
-        valid_columns = []
-        for col in board.columns:
-            if not col.is_archived:
-                active_cards = [
-                    card for card in col.cards
-                    if not card.is_archived
-                ]
-
-                active_cards.sort(key=lambda x: x.position)
-                col.cards = active_cards
-                valid_columns.append(col)
-
-        valid_columns.sort(key=lambda x: x.position)
-        board.columns = valid_columns
-        return board
-
-    def delete_board(self, board_id: int, user_id: int, permanent: bool = False):
-        board = self.db.query(Board).filter(Board.id == board_id).first()
-        if not board:
+    @replica_read
+    async def get_board_version(self, board_id: int) -> int:
+        version = await self.db.scalar(
+            select(Board.version).where(Board.id == board_id, Board.purge_requested_at.is_(None))
+        )
+        if version is None:
+            raise HTTPException(status_code=404, detail="Board not found")
+        return version
+
+    @replica_read
+    async def get_changes(self, board_id: int, since: int, user_id: int) -> dict:
+        """
+        Column / card đã tạo, sửa, archive, xoá sau version `since` của board.
+
+        sync_version của từng dòng và tombstone do trigger DB ghi (migration 0006).
+        Tombstone chỉ được giữ cho BOARD_SYNC_TOMBSTONE_VERSIONS version gần nhất
+        (SyncTombstonePruner): `since` cũ hơn thì trả về reset.
+        `version` được đọc trước các dòng thay đổi: client gửi lại nó làm `since` ở lần
+        sau, thay đổi commit xen giữa có thể bị gửi lại nhưng không bao giờ bị bỏ sót.
+        """
+        if await get_board_role(self.db, board_id, user_id) is None:
+            raise HTTPException(status_code=404, detail="Board not found or access denied")
+
+        version = await self.get_board_version(board_id)
+        if since > version or since < version - settings.BOARD_SYNC_TOMBSTONE_VERSIONS:
+            return {"version": version, "reset": True}
+        if since == version:
+            return {"version": version}
+
+        max_changes = settings.BOARD_SYNC_MAX_CHANGES
+        columns = (await self.db.scalars(
+            select(Column)
+            .where(Column.board_id == board_id, Column.sync_version > since)
+            .order_by(Column.position.asc())
+            .limit(max_changes + 1)
+        )).all()
+        cards = (await self.db.scalars(
+            select(Card)
+            .join(Column, Card.column_id == Column.id)
+            .where(Column.board_id == board_id, Card.sync_version > since)
+            .order_by(Card.column_id, Card.position.asc())
+            .limit(max_changes + 1)
+        )).all()
+        tombstones = (await self.db.execute(
+            select(SyncTombstone.entity, SyncTombstone.entity_id)
+            .where(SyncTombstone.board_id == board_id, SyncTombstone.version > since)
+            .limit(max_changes + 1)
+        )).all()
+
+        # Delta lớn hơn cả board thì tải lại toàn bộ rẻ hơn
+        if len(columns) + len(cards) + len(tombstones) > max_changes:
+            return {"version": version, "reset": True}
+
+        # Card / column vẫn đang nằm trong board (vd. chuyển đi rồi chuyển lại) không bị xoá
+        column_ids = {column.id for column in columns}
+        card_ids = {card.id for card in cards}
+        return {
+            "version": version,
+            "columns": columns,
+            "cards": cards,
+            "deleted_column_ids": sorted({
+                entity_id for entity, entity_id in tombstones if entity == "column" and entity_id not in column_ids
+            }),
+            "deleted_card_ids": sorted({
+                entity_id for entity, entity_id in tombstones if entity == "card" and entity_id not in card_ids
+            }),
+        }
+
+    @staticmethod
+    def snapshot_card_fields(fields: Optional[str]) -> tuple[str, ...]:
+        """Field của card trong snapshot theo `?fields=`, mặc định không có description."""
+        return parse_fields(fields, CARD_FIELDS, BOARD_CARD_FIELDS, required=("id", "column_id"))
+
+    @staticmethod
+    def snapshot_etag(board_id: int, version: int, card_fields: tuple[str, ...]) -> str:
+        """
+        ETag của snapshot: field mặc định giữ dạng "{board_id}-{version}", fieldset khác
+        thêm hash ngắn của danh sách field, để 304 không trả nhầm body của fieldset khác.
+        """
+        if card_fields == BOARD_CARD_FIELDS:
+            return f'"{board_id}-{version}"'
+        digest = hashlib.blake2s(",".join(card_fields).encode(), digest_size=4).hexdigest()
+        return f'"{board_id}-{version}-{digest}"'
+
+    async def get_board_snapshot(
+        self,
+        board_id: int,
+        version: int,
+        card_fields: tuple[str, ...] = BOARD_CARD_FIELDS
+    ) -> bytes:
+        """
+        Trả về JSON (bytes) của BoardDetailResponse cho `version`, ưu tiên đọc từ cache.
+        `version` phải được đọc trước khi load snapshot: dữ liệu load ra luôn mới
+        bằng hoặc hơn version đó, nên key cache không bao giờ trỏ tới dữ liệu cũ.
+
+        `card_fields`: field của card (xem snapshot_card_fields).
+        Chỉ snapshot với field mặc định được cache.
+
+        Cache miss: các request đồng thời cùng (board, version, fields) trong process chỉ
+        load + encode một lần, tất cả nhận cùng một bytes. Transaction đọc (version, quyền)
+        được kết thúc trước khi vào flight: request chờ leader không giữ connection của pool,
+        chỉ leader lấy lại connection khi chạy query.
+        """
+        if card_fields == BOARD_CARD_FIELDS:
+            body = await board_snapshot_cache.get(board_id, version)
+            if body is not None:
+                return body
+
+        await self.db.commit()
+        return await board_snapshot_flight.do(
+            (board_id, version, card_fields),
+            lambda: self._load_snapshot(board_id, version, card_fields)
+        )
+
+    async def _load_snapshot(self, board_id: int, version: int, card_fields: tuple[str, ...]) -> bytes:
+        body = await self.render_board_detail(board_id, card_fields)
+        if card_fields == BOARD_CARD_FIELDS:
+            await board_snapshot_cache.set(board_id, version, body)
+        return body
+
+    async def delete_board(self, board_id: int, user_id: int, permanent: bool = False):
+        board = await self.db.get(Board, board_id)
+        if not board or board.purge_requested_at is not None:
             raise HTTPException(status_code=404, detail="Board not found")
 
         if board.owner_id != user_id:
@@ -106,13 +285,19 @@ class BoardService:
                     status_code=400,
                     detail="Board must be closed before permanent deletion."
                 )
+            # Chỉ đánh dấu rồi trả về ngay; BoardPurger xoá dữ liệu theo lô ở background
             try:
-                self.db.delete(board)
-                self.db.commit()
-                logger.info(f"User {user_id} permanently deleted board {board_id}")
-                return {"message": "Board deleted permanently"}
+                await lock_board_async(self.db, board_id)
+                board.purge_requested_at = func.now()
+                await record_event(self.db, "board.deleted", board_id, user_id)
+                await self.db.commit()
+                board_snapshot_cache.invalidate(board_id)
+                acl_cache.invalidate_board(board_id)
+                board_purger.schedule(board_id)
+                logger.info(f"User {user_id} scheduled permanent deletion of board {board_id}")
+                return {"message": "Board deletion scheduled"}
             except Exception as e:
-                self.db.rollback()
+                await self.db.rollback()
                 logger.error(f"Error hard delete: {e}")
                 raise HTTPException(status_code=500, detail="Failed to delete permanently")
         else:
@@ -120,24 +305,23 @@ class BoardService:
                 raise HTTPException(status_code=400, detail="Board is already closed")
 
             board.is_closed = True
-            self.db.commit()
+            await bump_board_version_async(self.db, board_id)
+            await record_event(self.db, "board.closed", board_id, user_id)
+            await self.db.commit()
             logger.info(f"User {user_id} closed board {board_id}")
             return {"message": "Board closed successfully"}
 
-    def add_member(self, board_id: int, member_data: BoardMemberCreate, current_user_id: int):
-        board_member = self.db.query(BoardMember).filter(
+    async def add_member(self, board_id: int, member_data: BoardMemberCreate, current_user_id: int):
+        board_member = await self.db.scalar(select(BoardMember).where(
             BoardMember.board_id == board_id,
             BoardMember.user_id == current_user_id,
             BoardMember.role == "admin"
-        ).first()
+        ))
 
         if not board_member:
             raise HTTPException(status_code=403, detail="Only Board Admin can add members")
 
-        existing_member = self.db.query(BoardMember).filter(
-            BoardMember.board_id == board_id,
-            BoardMember.user_id == member_data.user_id
-        ).first()
+        existing_member = await self.db.get(BoardMember, (board_id, member_data.user_id))
 
         if existing_member:
             raise HTTPException(status_code=400, detail="User is already a member of this board")
@@ -149,23 +333,29 @@ class BoardService:
         )
 
         try:
+            await lock_board_async(self.db, board_id)
             self.db.add(new_member)
-            self.db.commit()
+            await record_event(
+                self.db, "board.member_added", board_id, current_user_id,
+                user_id=member_data.user_id, role=member_data.role
+            )
+            await self.db.commit()
+            await self.db.refresh(new_member)
+            acl_cache.invalidate_member(board_id, member_data.user_id)
             return new_member
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error adding member: {e}")
             raise HTTPException(status_code=500, detail="Failed to add member")
 
 
-    def get_board_members(self, board_id: int, current_user_id: int):
-        member = self.db.query(BoardMember).filter(
-            BoardMember.board_id == board_id,
-            BoardMember.user_id == current_user_id
-        ).first()
+    async def get_board_members(self, board_id: int, current_user_id: int):
+        member = await self.db.get(BoardMember, (board_id, current_user_id))
 
         if not member:
             pass
 
-        members = self.db.query(BoardMember).filter(BoardMember.board_id == board_id).all()
+        members = (await self.db.scalars(
+            select(BoardMember).where(BoardMember.board_id == board_id)
+        )).all()
         return members
\ No newline at end of file
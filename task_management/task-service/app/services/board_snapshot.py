@@ -0,0 +1,76 @@
+from typing import Optional, Sequence
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.tracing import traced
+from ..models.task import Board, Card, Column
+from ..schemas.board import BoardResponse
+from ..schemas.card import BOARD_CARD_FIELDS
+from ..schemas.column import ColumnResponse
+
+# Cột được select lấy đúng theo field của schema response, nên JSON ghi ra luôn khớp
+# BoardDetailResponse (tên, thứ tự field) mà không cần dựng ORM object hay model Pydantic.
+_BOARD_FIELDS = tuple(BoardResponse.model_fields)
+COLUMN_FIELDS = tuple(name for name in ColumnResponse.model_fields if name != "cards")
+
+_BOARD_SELECT = select(*(getattr(Board, name) for name in _BOARD_FIELDS))
+_COLUMN_SELECT = select(*(getattr(Column, name) for name in COLUMN_FIELDS))
+
+
+async def attach_cards(db: AsyncSession, columns: list[dict], card_fields: Sequence[str]) -> None:
+    """
+    Gán `cards` (card chưa archive, theo position, dạng dict chỉ gồm `card_fields`)
+    cho từng column dict. `card_fields` phải có id và column_id. Một query cho mọi column.
+    """
+    cards_by_column = {}
+    for column in columns:
+        column["cards"] = cards_by_column[column["id"]] = []
+
+    if cards_by_column:
+        result = await db.execute(
+            select(*(getattr(Card, name) for name in card_fields))
+            .where(
+                Card.column_id.in_(cards_by_column.keys()),
+                Card.is_archived == False
+            )
+            .order_by(Card.column_id, Card.position.asc())
+        )
+        column_index = card_fields.index("column_id")
+        for row in result:
+            cards_by_column[row[column_index]].append(dict(zip(card_fields, row)))
+
+
+@traced("board_snapshot.render")
+async def render_board_snapshot(
+    db: AsyncSession,
+    board_id: int,
+    card_fields: Sequence[str] = BOARD_CARD_FIELDS
+) -> Optional[bytes]:
+    """
+    JSON (bytes) của BoardDetailResponse cho board, None nếu board không tồn tại.
+    Card chỉ gồm `card_fields` (phải có id và column_id): chỉ các cột đó được đọc từ DB.
+
+    Đọc bằng Core row (tuple) thay vì ORM: không identity map, không instance state,
+    không validate lại dữ liệu vốn đã đúng kiểu từ DB. orjson encode một lần cho cả board.
+    """
+    board = (await db.execute(_BOARD_SELECT.where(Board.id == board_id))).first()
+    if board is None:
+        return None
+
+    columns = [
+        dict(zip(COLUMN_FIELDS, row))
+        for row in await db.execute(
+            _COLUMN_SELECT
+            .where(Column.board_id == board_id, Column.is_archived == False)
+            .order_by(Column.position.asc())
+        )
+    ]
+
+    await attach_cards(db, columns, card_fields)
+
+    snapshot = dict(zip(_BOARD_FIELDS, board))
+    snapshot["columns"] = columns
+    # OPT_UTC_Z: datetime UTC ghi là "...Z" giống Pydantic, để body không đổi khi chuyển từ model_dump_json
+    return orjson.dumps(snapshot, option=orjson.OPT_UTC_Z)
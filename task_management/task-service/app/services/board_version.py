@@ -0,0 +1,48 @@
+from typing import Optional
+
+from sqlalchemy import select, update, Update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.task import Board
+
+
+def _bump_stmt(board_ids: tuple) -> Optional[Update]:
+    ids = {board_id for board_id in board_ids if board_id is not None}
+    if not ids:
+        return None
+
+    return (
+        update(Board)
+        .where(Board.id.in_(ids))
+        .values(version=Board.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_board_version(db: Session, *board_ids: int) -> None:
+    """
+    Tăng Board.version trong transaction hiện tại.
+    Gọi ở mọi thao tác làm thay đổi nội dung board, để snapshot cache và ETag
+    của GET /boards/{board_id} được làm mới. Gọi TRƯỚC khi ghi card / column
+    (kể cả flush): trigger gán sync_version cho delta sync theo version hiện tại.
+    """
+    stmt = _bump_stmt(board_ids)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+async def bump_board_version_async(db: AsyncSession, *board_ids: int) -> None:
+    """Như bump_board_version, cho AsyncSession."""
+    stmt = _bump_stmt(board_ids)
+    if stmt is not None:
+        await db.execute(stmt)
+
+
+async def lock_board_async(db: AsyncSession, board_id: int) -> None:
+    """
+    Khoá dòng board tới hết transaction mà không tăng version: cho thao tác ghi event
+    của board nhưng không đổi nội dung board (member, xoá board), để event vẫn xếp
+    sau các transaction khác đang giữ khoá board (xem outbox.record_events).
+    """
+    await db.execute(select(Board.id).where(Board.id == board_id).with_for_update())
@@ -1,146 +1,504 @@
+from typing import Optional, List
+
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    Boolean, Integer, String, cast, delete, func, insert, select, tuple_, update, values, column as sql_column
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
 from starlette import status
 
-from ..schemas.card import CardCreate, CardUpdate, CardAssignmentCreate
-from ..models.task import Card, BoardMember, Board, Column, CardAssignment
-
-POSITION_GAP = 65536.0
-
+from ..core.fields import parse_fields
+from ..core.metrics import instrument_service
+from ..core.pagination import encode_cursor, decode_cursor
+from ..db.routing import replica_read
+from ..schemas.card import CardCreate, CardUpdate, CardAssignmentCreate, CardBulkItem, CARD_FIELDS
+from ..models.task import Card, BoardMember, Board, Column, CardAssignment, Label, card_labels, CARD_SEARCH_CONFIG
+from .board_version import bump_board_version_async
+from .fractional_index import key_between, n_keys_between
+from .ordering import find_neighbor_positions
+from .outbox import event, record_event, record_events
+from .permissions import get_board_role, get_column_access
+from .rebalancer import order_key_rebalancer
+
+@instrument_service
 class CardService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         
-    def get_cards_in_column(self, user_id: int, column_id: int) -> list[Card]:
-        cards = (
-            self.db.query(Card)
+    @replica_read
+    async def get_cards_in_column(
+        self,
+        user_id: int,
+        column_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[str] = None
+    ) -> dict:
+        card_fields = parse_fields(fields, CARD_FIELDS, CARD_FIELDS)
+        query = (
+            select(Card)
+            # position cần cho cursor; các field không được chọn không được đọc từ DB
+            .options(load_only(*(getattr(Card, name) for name in dict.fromkeys((*card_fields, "position")))))
             
             .join(Column, Card.column_id == Column.id)
             .join(Board, Column.board_id == Board.id)
             .join(BoardMember, Board.id == BoardMember.board_id)
-                
-            .options(
-                joinedload(Card.labels),
-                joinedload(Card.assignments)
-            )
 
-            .filter(
+            .where(
                 Card.column_id == column_id,     
                 BoardMember.user_id == user_id,   
                 Card.is_archived == False         
             )
-                
-                .order_by(Card.position.asc())
-                .all()
+        )
+
+        if cursor:
+            last_position, last_id = decode_cursor(cursor, size=2)
+            query = query.where(tuple_(Card.position, Card.id) > tuple_(last_position, last_id))
+
+        cards = (await self.db.scalars(
+            query
+            .order_by(Card.position.asc(), Card.id.asc())
+            .limit(limit + 1)
+        )).all()
+
+        next_cursor = None
+        if len(cards) > limit:
+            cards = cards[:limit]
+            next_cursor = encode_cursor(cards[-1].position, cards[-1].id)
+        return {
+            "items": [{name: getattr(card, name) for name in card_fields} for card in cards],
+            "next_cursor": next_cursor
+        }
+
+    @replica_read
+    async def get_card(self, card_id: int, user_id: int) -> Card:
+        card = await self.db.get(Card, card_id)
+        if not card:
+            raise HTTPException(status_code=404, detail="Card not found")
+
+        await self._check_column_board_member(card.column_id, user_id)
+        return card
+
+    @replica_read
+    async def search(
+        self,
+        user_id: int,
+        q: str,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> dict:
+        """
+        Tìm card theo title/description trên các board user là thành viên.
+        Khớp qua GIN index của search_vector, sắp theo độ liên quan, keyset (rank, id).
+        """
+        # websearch_to_tsquery chấp nhận cú pháp tự do ("cụm từ", -loại trừ, or), không lỗi với input bẩn.
+        # regconfig phải cast tường minh: asyncpg gửi tham số kiểu VARCHAR
+        ts_query = func.websearch_to_tsquery(cast(CARD_SEARCH_CONFIG, REGCONFIG), q)
+        rank = func.ts_rank_cd(Card.search_vector, ts_query)
+
+        query = (
+            select(Card, Column.board_id, rank.label("rank"))
+            .join(Column, Card.column_id == Column.id)
+            .join(BoardMember, Column.board_id == BoardMember.board_id)
+            .where(
+                Card.search_vector.op("@@")(ts_query),
+                BoardMember.user_id == user_id,
+                Card.is_archived == False,
+                Column.is_archived == False
             )
-        return cards
-
-    def _check_column_board_member(self, column_id: int, user_id: int):
-        has_permission = (
-            self.db.query(BoardMember)
-            .join(Board, BoardMember.board_id == Board.id)
-            .join(Column, Board.id == Column.board_id)
-            .filter(
-                Column.id == column_id,
-                BoardMember.user_id == user_id
+        )
+
+        if cursor:
+            last_rank, last_id = decode_cursor(cursor, size=2)
+            query = query.where(tuple_(rank, Card.id) < tuple_(last_rank, last_id))
+
+        rows = (await self.db.execute(
+            query
+            .order_by(rank.desc(), Card.id.desc())
+            .limit(limit + 1)
+        )).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].Card.id)
+        return {
+            "items": [{"card": row.Card, "board_id": row.board_id, "rank": row.rank} for row in rows],
+            "next_cursor": next_cursor
+        }
+
+    @replica_read
+    async def get_assigned_cards(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> dict:
+        """
+        Card đang hoạt động được giao cho user trên mọi board user còn là thành viên.
+        Duyệt ix_card_assignments_user_id_card_id theo card_id giảm dần (card mới trước), keyset theo card_id.
+        """
+        query = (
+            select(Card, Board.id.label("board_id"), Board.title.label("board_title"), Column.title.label("column_title"))
+            .select_from(CardAssignment)
+            .join(Card, CardAssignment.card_id == Card.id)
+            .join(Column, Card.column_id == Column.id)
+            .join(Board, Column.board_id == Board.id)
+            .join(BoardMember, (BoardMember.board_id == Board.id) & (BoardMember.user_id == user_id))
+            .where(
+                CardAssignment.user_id == user_id,
+                Card.is_archived == False,
+                Column.is_archived == False,
+                Board.is_closed == False
             )
-            .first()
         )
 
-        if not has_permission:
+        if cursor:
+            (last_card_id,) = decode_cursor(cursor, size=1)
+            query = query.where(CardAssignment.card_id < last_card_id)
+
+        rows = (await self.db.execute(
+            query
+            .order_by(CardAssignment.card_id.desc())
+            .limit(limit + 1)
+        )).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].Card.id)
+        return {
+            "items": [
+                {"card": row.Card, "board_id": row.board_id, "board_title": row.board_title, "column_title": row.column_title}
+                for row in rows
+            ],
+            "next_cursor": next_cursor
+        }
+
+    async def _check_column_board_member(self, column_id: int, user_id: int) -> int:
+        """Kiểm tra quyền trên board chứa column, trả về board_id."""
+        board_id, role = await get_column_access(self.db, column_id, user_id)
+
+        if board_id is None or role is None:
             raise HTTPException(
                 status_code=404,
                 detail="Column not found or access denied"
             )
 
-    def create(self, card_data: CardCreate, user_id: int) -> Card:
-        column = self.db.query(Column).filter(
-            Column.id == card_data.column_id
-        ).first()
-
-        if not column:
-            raise HTTPException(status_code=404, detail="Column not found")
-
-        self._check_column_board_member(card_data.column_id, user_id)
-
-        last_card = self.db.query(Card).filter(
-            Card.column_id == card_data.column_id
-        ).order_by(Card.position.desc()).first()
+        return board_id
 
-        new_pos = (last_card.position + POSITION_GAP) if last_card else POSITION_GAP
-
-        new_card = Card(
-            title=card_data.title,
-            description=card_data.description,
-            column_id=card_data.column_id,
-            position=new_pos
-        )
+    async def create(self, card_data: CardCreate, user_id: int) -> Card:
+        board_id = await self._check_column_board_member(card_data.column_id, user_id)
 
         try:
+            # Tăng version (khoá dòng board tới commit) TRƯỚC khi đọc key cuối: các thao tác
+            # ghi cùng board chạy tuần tự nên không sinh trùng key; trigger gán sync_version theo version mới
+            await bump_board_version_async(self.db, board_id)
+
+            last_position = await self.db.scalar(
+                select(Card.position)
+                .where(Card.column_id == card_data.column_id)
+                .order_by(Card.position.desc())
+                .limit(1)
+            )
+
+            new_card = Card(
+                title=card_data.title,
+                description=card_data.description,
+                column_id=card_data.column_id,
+                position=key_between(last_position, None)
+            )
             self.db.add(new_card)
-            self.db.commit()
-            self.db.refresh(new_card)
+            await self.db.flush()
+            await record_event(
+                self.db, "card.created", board_id, user_id,
+                card_id=new_card.id, column_id=new_card.column_id, title=new_card.title, position=new_card.position
+            )
+            await self.db.commit()
+            await self.db.refresh(new_card)
+            order_key_rebalancer.schedule_if_needed("card", new_card.column_id, new_card.position)
             return new_card
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Error creating card: {e}")
 
-    def update(self, card_id: int, update_data: CardUpdate, user_id: int) -> Card:
-        card = self.db.query(Card).filter(Card.id == card_id).first()
+    async def update(self, card_id: int, update_data: CardUpdate, user_id: int) -> Card:
+        card = await self.db.get(Card, card_id)
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
 
-        target_column_id = update_data.column_id if update_data.column_id is not None else card.column_id
-        self._check_column_board_member(target_column_id, user_id)
+        # Quyền trên board đang chứa card (như get_card), rồi trên board đích nếu chuyển column
+        source_column_id = card.column_id
+        source_board_id = await self._check_column_board_member(source_column_id, user_id)
+        target_column_id = update_data.column_id if update_data.column_id is not None else source_column_id
+        board_id = source_board_id
+        if target_column_id != source_column_id:
+            board_id = await self._check_column_board_member(target_column_id, user_id)
 
         if update_data.title is not None:
             card.title = update_data.title
         if update_data.description is not None:
             card.description = update_data.description
 
-        if update_data.new_index is not None or (update_data.column_id and update_data.column_id != card.column_id):
-            target_index = update_data.new_index if update_data.new_index is not None else 0
-
-            cards_in_col = (
-                self.db.query(Card)
-                .filter(Card.column_id == target_column_id, Card.id != card_id)
-                .order_by(Card.position.asc())
-                .all()
-            )
+        is_reorder = (
+            update_data.new_index is not None
+            or update_data.after_id is not None
+            or update_data.before_id is not None
+        )
+        has_ties = False
 
-            new_position = 0.0
+        try:
+            # Khoá board trước khi đọc key hàng xóm (xem create)
+            await bump_board_version_async(self.db, board_id, source_board_id)
+
+            if is_reorder or target_column_id != card.column_id:
+                prev_pos, next_pos, has_ties = await find_neighbor_positions(
+                    self.db,
+                    Card,
+                    Card.column_id == target_column_id,
+                    exclude_id=card_id,
+                    new_index=update_data.new_index,
+                    after_id=update_data.after_id,
+                    before_id=update_data.before_id
+                )
 
-            if not cards_in_col:
-                new_position = POSITION_GAP
+                card.column_id = target_column_id
+                card.position = key_between(prev_pos, next_pos)
 
-            elif target_index == 0:
-                new_position = cards_in_col[0].position / 2.0
+            if board_id != source_board_id:
+                await self.db.flush()
+                await self._drop_foreign_labels([card_id])
 
-            elif target_index >= len(cards_in_col):
-                new_position = cards_in_col[-1].position + POSITION_GAP
+            fields = {"card_id": card_id, "column_id": card.column_id, "title": card.title, "position": card.position}
+            if target_column_id != source_column_id:
+                # Chuyển sang board khác: cả hai board đều nhận event
+                await record_events(self.db, [
+                    event("card.moved", board, user_id, from_column_id=source_column_id, **fields)
+                    for board in dict.fromkeys((source_board_id, board_id))
+                ])
+            else:
+                await record_event(self.db, "card.updated", board_id, user_id, **fields)
+            await self.db.commit()
+            await self.db.refresh(card)
+            if has_ties:
+                order_key_rebalancer.schedule("card", card.column_id)
+            else:
+                order_key_rebalancer.schedule_if_needed("card", card.column_id, card.position)
+            return card
+        except HTTPException:
+            await self.db.rollback()
+            raise
+        except Exception as e:
+            await self.db.rollback()
+            raise HTTPException(status_code=500, detail=f"Error updating card: {e}")
 
+    async def bulk_update(self, items: List[CardBulkItem], user_id: int) -> List[dict]:
+        """
+        Áp dụng nhiều thao tác update/move trong một transaction:
+        kiểm tra quyền một lần cho mỗi board, một câu UPDATE ... FROM (VALUES ...)
+        cho mọi field và position, trả về kết quả theo từng item.
+        """
+        card_ids = {item.card_id for item in items}
+        current = {
+            row.id: row
+            for row in await self.db.execute(
+                select(Card.id, Card.column_id, Column.board_id)
+                .join(Column, Card.column_id == Column.id)
+                .where(Card.id.in_(card_ids))
+            )
+        }
+
+        target_column_ids = {item.column_id for item in items if item.column_id is not None}
+        column_boards = dict((await self.db.execute(
+            select(Column.id, Column.board_id).where(Column.id.in_(target_column_ids))
+        )).all()) if target_column_ids else {}
+
+        board_ids = {row.board_id for row in current.values()} | set(column_boards.values())
+        allowed_boards = {
+            board_id for board_id in board_ids
+            if await get_board_role(self.db, board_id, user_id) is not None
+        }
+
+        label_ids = {label_id for item in items if item.label_ids for label_id in item.label_ids}
+        label_boards = dict((await self.db.execute(
+            select(Label.id, Label.board_id).where(Label.id.in_(label_ids))
+        )).all()) if label_ids else {}
+
+        accepted: list[CardBulkItem] = []
+        failures: dict[int, str] = {}
+        seen: set[int] = set()
+        for index, item in enumerate(items):
+            row = current.get(item.card_id)
+            board_id = row.board_id if row else None
+            if item.column_id is not None:
+                board_id = column_boards.get(item.column_id)
+
+            if item.card_id in seen:
+                failures[index] = "Duplicate card in request"
+            elif row is None or row.board_id not in allowed_boards:
+                failures[index] = "Card not found or access denied"
+            elif board_id not in allowed_boards:
+                failures[index] = "Column not found or access denied"
+            elif item.label_ids and any(label_boards.get(label_id) != board_id for label_id in item.label_ids):
+                failures[index] = "Label not found on this board"
             else:
-                prev_pos = cards_in_col[target_index - 1].position
-                next_pos = cards_in_col[target_index].position
-                new_position = (prev_pos + next_pos) / 2.0
+                accepted.append(item)
+            seen.add(item.card_id)
+
+        # Card chuyển column được thêm vào cuối column đích, giữ thứ tự trong request
+        moves: dict[int, list[int]] = {}
+        for item in accepted:
+            if item.column_id is not None and item.column_id != current[item.card_id].column_id:
+                moves.setdefault(item.column_id, []).append(item.card_id)
+
+        relabels = {item.card_id: set(item.label_ids) for item in accepted if item.label_ids is not None}
 
-            card.column_id = target_column_id
-            card.position = new_position
+        affected_boards = {current[item.card_id].board_id for item in accepted}
+        affected_boards |= {column_boards[column_id] for column_id in moves}
 
+        new_positions: dict[int, str] = {}
         try:
-            self.db.commit()
-            self.db.refresh(card)
-            return card
+            # Tăng version (khoá các board) trước khi đọc key cuối và ghi: xem create
+            await bump_board_version_async(self.db, *affected_boards)
+
+            if moves:
+                last_positions = dict((await self.db.execute(
+                    select(Card.column_id, func.max(Card.position))
+                    .where(Card.column_id.in_(moves.keys()))
+                    .group_by(Card.column_id)
+                )).all())
+                for column_id, moved_ids in moves.items():
+                    keys = n_keys_between(last_positions.get(column_id), None, len(moved_ids))
+                    new_positions.update(zip(moved_ids, keys))
+
+            rows = [
+                (
+                    item.card_id,
+                    item.title,
+                    item.description,
+                    item.is_archived,
+                    item.column_id if item.card_id in new_positions else None,
+                    new_positions.get(item.card_id)
+                )
+                for item in accepted
+                if item.card_id in new_positions
+                or item.title is not None
+                or item.description is not None
+                or item.is_archived is not None
+            ]
+
+            if rows:
+                changes = values(
+                    sql_column("id", Integer),
+                    sql_column("title", String),
+                    sql_column("description", String),
+                    sql_column("is_archived", Boolean),
+                    sql_column("column_id", Integer),
+                    sql_column("position", String),
+                    name="changes"
+                ).data(rows)
+
+                # NULL trong VALUES nghĩa là giữ nguyên giá trị cũ
+                await self.db.execute(
+                    update(Card)
+                    .where(Card.id == changes.c.id)
+                    .values(
+                        title=func.coalesce(changes.c.title, Card.title),
+                        description=func.coalesce(changes.c.description, Card.description),
+                        is_archived=func.coalesce(cast(changes.c.is_archived, Boolean), Card.is_archived),
+                        column_id=func.coalesce(cast(changes.c.column_id, Integer), Card.column_id),
+                        position=func.coalesce(changes.c.position, Card.position)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+
+            if relabels:
+                await self.db.execute(delete(card_labels).where(card_labels.c.card_id.in_(relabels.keys())))
+                pairs = [
+                    {"card_id": card_id, "label_id": label_id}
+                    for card_id, label_ids in relabels.items()
+                    for label_id in label_ids
+                ]
+                if pairs:
+                    await self.db.execute(insert(card_labels), pairs)
+
+            cross_board = [
+                item.card_id for item in accepted
+                if item.card_id in new_positions and column_boards[item.column_id] != current[item.card_id].board_id
+            ]
+            if cross_board:
+                await self._drop_foreign_labels(cross_board)
+
+            await record_events(self.db, self._bulk_events(accepted, current, column_boards, new_positions, user_id))
+            await self.db.commit()
         except Exception as e:
-            self.db.rollback()
-            raise HTTPException(status_code=500, detail=f"Error updating card: {e}")
+            await self.db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to apply bulk update: {e}")
+
+        for column_id, moved_ids in moves.items():
+            order_key_rebalancer.schedule_if_needed("card", column_id, new_positions[moved_ids[-1]])
+
+        updated = {
+            card.id: card
+            for card in await self.db.scalars(
+                select(Card).where(Card.id.in_([item.card_id for item in accepted]))
+            )
+        } if accepted else {}
+
+        results = []
+        for index, item in enumerate(items):
+            if index in failures:
+                results.append({"card_id": item.card_id, "ok": False, "error": failures[index]})
+            else:
+                results.append({"card_id": item.card_id, "ok": True, "card": updated[item.card_id]})
+        return results
+
+    async def _drop_foreign_labels(self, card_ids: List[int]) -> None:
+        # Label thuộc về board: card đã chuyển sang board khác bỏ label của board cũ
+        await self.db.execute(
+            delete(card_labels)
+            .where(
+                card_labels.c.card_id.in_(card_ids),
+                card_labels.c.card_id == Card.id,
+                card_labels.c.label_id == Label.id,
+                Card.column_id == Column.id,
+                Label.board_id != Column.board_id
+            )
+        )
 
-    def delete(self, card_id: int, user_id: int, permanent: bool = False):
-        card = self.db.query(Card).filter(Card.id == card_id).first()
+    @staticmethod
+    def _bulk_events(accepted, current, column_boards, new_positions, user_id) -> list[dict]:
+        events = []
+        for item in accepted:
+            row = current[item.card_id]
+            changes = {
+                name: value
+                for name, value in (("title", item.title), ("description", item.description), ("is_archived", item.is_archived))
+                if value is not None
+            }
+            if item.label_ids is not None:
+                changes["label_ids"] = sorted(set(item.label_ids))
+
+            if item.card_id in new_positions:
+                target_board = column_boards[item.column_id]
+                for board in dict.fromkeys((row.board_id, target_board)):
+                    events.append(event(
+                        "card.moved", board, user_id,
+                        card_id=item.card_id, from_column_id=row.column_id, column_id=item.column_id,
+                        position=new_positions[item.card_id], **changes
+                    ))
+            elif changes:
+                events.append(event("card.updated", row.board_id, user_id, card_id=item.card_id, **changes))
+        return events
+
+    async def delete(self, card_id: int, user_id: int, permanent: bool = False):
+        card = await self.db.get(Card, card_id)
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
 
-        self._check_column_board_member(card.column_id, user_id)
+        board_id = await self._check_column_board_member(card.column_id, user_id)
 
         if permanent:
             if not card.is_archived:
@@ -149,19 +507,14 @@ class CardService:
                     detail="Column must be archived before permanent deletion."
                 )
 
-            column_id = card.column_id
-            deleted_pos = card.position
-
             try:
-                self.db.delete(card)
-                self.db.query(Card).filter(
-                    Card.column_id == column_id,
-                    Card.position > deleted_pos
-                ).update({Card.position: Card.position - 1}, synchronize_session=False)
-                self.db.commit()
+                await self.db.delete(card)
+                await bump_board_version_async(self.db, board_id)
+                await record_event(self.db, "card.deleted", board_id, user_id, card_id=card_id, column_id=card.column_id)
+                await self.db.commit()
                 return {"message": "Card deleted permanently"}
             except Exception as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise HTTPException(status_code=500, detail=f"Failed to delete card: {str(e)}")
 
         else:
@@ -173,18 +526,20 @@ class CardService:
 
             try:
                 card.is_archived = True
-                self.db.commit()
+                await bump_board_version_async(self.db, board_id)
+                await record_event(self.db, "card.archived", board_id, user_id, card_id=card_id, column_id=card.column_id)
+                await self.db.commit()
                 return {"message": "Card archived successfully"}
             except Exception as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise HTTPException(status_code=500, detail=f"Failed to archive column: {str(e)}")
 
-    def unarchived_card(self, card_id: int, user_id: int) -> Column:
-        card = self.db.query(Card).filter(Card.id == card_id).first()
+    async def unarchived_card(self, card_id: int, user_id: int) -> Column:
+        card = await self.db.get(Card, card_id)
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
 
-        self._check_column_board_member(card.column_id, user_id=user_id)
+        board_id = await self._check_column_board_member(card.column_id, user_id=user_id)
 
         if not card.is_archived:
             raise HTTPException(
@@ -194,37 +549,31 @@ class CardService:
 
         try:
             card.is_archived = False
-            self.db.commit()
-            self.db.refresh(card)
+            await bump_board_version_async(self.db, board_id)
+            await record_event(self.db, "card.restored", board_id, user_id, card_id=card_id, column_id=card.column_id)
+            await self.db.commit()
+            await self.db.refresh(card)
             return card
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to restore card: {str(e)}")
 
-    def add_assignee(self, card_id: int, assignment_data: CardAssignmentCreate, current_user_id: int):
-        card = self.db.query(Card).options(joinedload(Card.column)).filter(Card.id == card_id).first()
+    async def add_assignee(self, card_id: int, assignment_data: CardAssignmentCreate, current_user_id: int):
+        card = await self.db.get(Card, card_id, options=[joinedload(Card.column)])
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
 
         board_id = card.column.board_id
 
-        self._check_column_board_member(card.column_id, current_user_id)
-
-        target_user_in_board = self.db.query(BoardMember).filter(
-            BoardMember.board_id == board_id,
-            BoardMember.user_id == assignment_data.user_id
-        ).first()
+        await self._check_column_board_member(card.column_id, current_user_id)
 
-        if not target_user_in_board:
+        if await get_board_role(self.db, board_id, assignment_data.user_id) is None:
             raise HTTPException(
                 status_code=400,
                 detail="User must be a member of the Board before being assigned to a card"
             )
 
-        existing_assignment = self.db.query(CardAssignment).filter(
-            CardAssignment.card_id == card_id,
-            CardAssignment.user_id == assignment_data.user_id
-        ).first()
+        existing_assignment = await self.db.get(CardAssignment, (card_id, assignment_data.user_id))
 
         if existing_assignment:
             raise HTTPException(status_code=409, detail="User already assigned to this card")
@@ -237,22 +586,27 @@ class CardService:
 
         try:
             self.db.add(new_assignment)
-            self.db.commit()
-            self.db.refresh(new_assignment)
+            await bump_board_version_async(self.db, board_id)
+            await record_event(
+                self.db, "card.assigned", board_id, current_user_id,
+                card_id=card_id, user_id=assignment_data.user_id, title=card.title
+            )
+            await self.db.commit()
+            await self.db.refresh(new_assignment)
             return new_assignment
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to assign user: {str(e)}")
 
-    def get_card_assignees(self, card_id: int, current_user_id: int):
-        card = self.db.query(Card).options(joinedload(Card.column)).filter(Card.id == card_id).first()
+    async def get_card_assignees(self, card_id: int, current_user_id: int):
+        card = await self.db.get(Card, card_id)
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
 
-        self._check_column_board_member(card.column_id, current_user_id)
+        await self._check_column_board_member(card.column_id, current_user_id)
 
-        assignments = self.db.query(CardAssignment).filter(
-            CardAssignment.card_id == card_id
-        ).all()
+        assignments = (await self.db.scalars(
+            select(CardAssignment).where(CardAssignment.card_id == card_id)
+        )).all()
 
         return assignments
\ No newline at end of file
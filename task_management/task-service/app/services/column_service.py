@@ -1,133 +1,161 @@
+from typing import Optional
+
 from fastapi import HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from starlette import status
 
+from ..core.fields import parse_fields
+from ..core.metrics import instrument_service
+from ..schemas.card import CARD_FIELDS, BOARD_CARD_FIELDS
 from ..schemas.column import ColumnCreate, ColumnUpdate
-from ..models.task import Column, BoardMember, Board
-
-POSITION_GAP = 65536.0
-
+from ..models.task import Column, BoardMember
+from ..core.acl_cache import acl_cache
+from ..db.routing import replica_read
+from .board_snapshot import COLUMN_FIELDS, attach_cards
+from .board_version import bump_board_version_async
+from .outbox import record_event
+from .fractional_index import key_between
+from .ordering import find_neighbor_positions
+from .permissions import get_board_role
+from .rebalancer import order_key_rebalancer
+
+@instrument_service
 class ColumnService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_columns_by_board(self, user_id: int, board_id: int, include_archived: bool = False) -> list[Column]:
+    @replica_read
+    async def get_columns_by_board(
+        self,
+        user_id: int,
+        board_id: int,
+        include_archived: bool = False,
+        fields: Optional[str] = None
+    ) -> list[dict]:
+        # Card như board snapshot: chưa archive, mặc định không có description, chỉ đọc field được chọn
+        card_fields = parse_fields(fields, CARD_FIELDS, BOARD_CARD_FIELDS, required=("id", "column_id"))
         query = (
-            self.db.query(Column)
-            .join(Board, Column.board_id == Board.id)
-            .join(BoardMember, Board.id == BoardMember.board_id)
-            .filter(
+            select(*(getattr(Column, name) for name in COLUMN_FIELDS))
+            .join(BoardMember, Column.board_id == BoardMember.board_id)
+            .where(
                 BoardMember.user_id == user_id,
                 Column.board_id == board_id
             )
         )
         # Filter out archived columns if not requested
         if not include_archived:
-            query = query.filter(Column.is_archived == False)
+            query = query.where(Column.is_archived == False)
 
-        return query.order_by(Column.position.asc()).all()
+        columns = [
+            dict(zip(COLUMN_FIELDS, row))
+            for row in await self.db.execute(query.order_by(Column.position.asc()))
+        ]
+        await attach_cards(self.db, columns, card_fields)
+        return columns
 
-    def _check_board_member(self, board_id: int, user_id: int) -> None:
-        board_member = (
-            self.db.query(BoardMember)
-            .filter(
-                BoardMember.board_id == board_id,
-                BoardMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not board_member:
+    async def _check_board_member(self, board_id: int, user_id: int) -> None:
+        if await get_board_role(self.db, board_id, user_id) is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You do not have permission to add column to this board"
             )
 
+    async def _get_column(self, column_id: int, with_cards: bool = False) -> Column:
+        query = select(Column).where(Column.id == column_id)
+        if with_cards:
+            # Response có danh sách card: load trước, AsyncSession không lazy load được
+            query = query.options(selectinload(Column.cards)).execution_options(populate_existing=True)
 
-    def create_column(self, column_data: ColumnCreate, user_id: int) -> Column:
-        self._check_board_member(column_data.board_id, user_id=user_id)
-
-        last_column = self.db.query(Column).filter(
-            Column.board_id == column_data.board_id
-        ).order_by(Column.position.desc()).first()
-
-        new_position = (last_column.position + POSITION_GAP) if last_column else POSITION_GAP
+        column = await self.db.scalar(query)
+        if not column:
+            raise HTTPException(status_code=404, detail="Column not found")
+        return column
 
-        new_column = Column(
-            title=column_data.title,
-            board_id=column_data.board_id,
-            position=new_position
-        )
+    async def create_column(self, column_data: ColumnCreate, user_id: int) -> Column:
+        await self._check_board_member(column_data.board_id, user_id=user_id)
 
         try:
+            # Tăng version (khoá dòng board tới commit) TRƯỚC khi đọc key cuối: các thao tác
+            # ghi cùng board chạy tuần tự nên không sinh trùng key; trigger gán sync_version theo version mới
+            await bump_board_version_async(self.db, column_data.board_id)
+
+            last_position = await self.db.scalar(
+                select(Column.position)
+                .where(Column.board_id == column_data.board_id)
+                .order_by(Column.position.desc())
+                .limit(1)
+            )
+
+            new_column = Column(
+                title=column_data.title,
+                board_id=column_data.board_id,
+                position=key_between(last_position, None)
+            )
             self.db.add(new_column)
-            self.db.commit()
-            self.db.refresh(new_column)
+            await self.db.flush()
+            await record_event(
+                self.db, "column.created", column_data.board_id, user_id,
+                column_id=new_column.id, title=new_column.title, position=new_column.position
+            )
+            await self.db.commit()
+            await self.db.refresh(new_column)
 
-            new_column.cards = []
+            set_committed_value(new_column, "cards", [])
             return new_column
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to create column: {str(e)}")
 
-    def update_column(self, column_id: int, update_data: ColumnUpdate, user_id: int) -> Column:
-        column = (
-            self.db.query(Column)
-            .options(joinedload(Column.cards))
-            .filter(Column.id == column_id).first()
-        )
-        if not column:
-            raise HTTPException(status_code=404, detail="Column not found")
+    async def update_column(self, column_id: int, update_data: ColumnUpdate, user_id: int) -> Column:
+        column = await self._get_column(column_id)
 
-        self._check_board_member(column.board_id, user_id=user_id)
+        await self._check_board_member(column.board_id, user_id=user_id)
 
         if update_data.title is not None:
             column.title = update_data.title
+        has_ties = False
 
-        if update_data.new_index is not None:
-            target_index = update_data.new_index
-            board_id = column.board_id
+        try:
+            # Khoá board trước khi đọc key hàng xóm (xem create_column)
+            await bump_board_version_async(self.db, column.board_id)
+
+            if update_data.new_index is not None or update_data.after_id is not None or update_data.before_id is not None:
+                prev_pos, next_pos, has_ties = await find_neighbor_positions(
+                    self.db,
+                    Column,
+                    Column.board_id == column.board_id,
+                    exclude_id=column_id,
+                    new_index=update_data.new_index,
+                    after_id=update_data.after_id,
+                    before_id=update_data.before_id
+                )
+                column.position = key_between(prev_pos, next_pos)
 
-            column_in_boards = (
-                self.db.query(Column)
-                .filter(Column.board_id == board_id, Column.id != column_id)
-                .order_by(Column.position.asc())
-                .all()
+            await record_event(
+                self.db, "column.updated", column.board_id, user_id,
+                column_id=column_id, title=column.title, position=column.position
             )
-
-            new_position = 0.0
-
-            if not column_in_boards:
-                new_position = POSITION_GAP
-
-            elif target_index == 0:
-                new_position = column_in_boards[0].position / 2.0
-
-            elif target_index >= len(column_in_boards):
-                new_position = column_in_boards[-1].position + POSITION_GAP
-
+            await self.db.commit()
+            column = await self._get_column(column_id, with_cards=True)
+            if has_ties:
+                order_key_rebalancer.schedule("column", column.board_id)
             else:
-                prev_pos = column_in_boards[target_index - 1].position
-                next_pos = column_in_boards[target_index].position
-                new_position = (prev_pos + next_pos) / 2.0
-
-            column.position = new_position
-
-        try:
-            self.db.commit()
-            self.db.refresh(column)
+                order_key_rebalancer.schedule_if_needed("column", column.board_id, column.position)
             return column
+        except HTTPException:
+            await self.db.rollback()
+            raise
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to update column: {str(e)}")
 
-    def delete_column(self, column_id: int, user_id: int, permanent: bool = False):
-        column = self.db.query(Column).filter(Column.id == column_id).first()
-        if not column:
-            raise HTTPException(status_code=404, detail="Column not found")
+    async def delete_column(self, column_id: int, user_id: int, permanent: bool = False):
+        column = await self._get_column(column_id)
 
-        self._check_board_member(column.board_id, user_id=user_id)
+        await self._check_board_member(column.board_id, user_id=user_id)
 
         if permanent:
             if not column.is_archived:
@@ -137,20 +165,16 @@ class ColumnService:
                 )
 
             board_id = column.board_id
-            deleted_pos = column.position
 
             try:
-                self.db.delete(column)
-
-                self.db.query(Column).filter(
-                    Column.board_id == board_id,
-                    Column.position > deleted_pos
-                ).update({Column.position: Column.position - 1}, synchronize_session=False)
-
-                self.db.commit()
+                await self.db.delete(column)
+                await bump_board_version_async(self.db, board_id)
+                await record_event(self.db, "column.deleted", board_id, user_id, column_id=column_id)
+                await self.db.commit()
+                acl_cache.invalidate_column(column_id)
                 return {"message": "Column deleted permanently"}
             except Exception as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise HTTPException(status_code=500, detail=f"Failed to delete column: {str(e)}")
 
         else:
@@ -162,18 +186,18 @@ class ColumnService:
 
             try:
                 column.is_archived = True
-                self.db.commit()
+                await bump_board_version_async(self.db, column.board_id)
+                await record_event(self.db, "column.archived", column.board_id, user_id, column_id=column_id)
+                await self.db.commit()
                 return {"message": "Column archived successfully"}
             except Exception as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise HTTPException(status_code=500, detail=f"Failed to archive column: {str(e)}")
 
-    def unarchived_column(self, column_id: int, user_id: int) -> Column:
-        column = self.db.query(Column).filter(Column.id == column_id).first()
-        if not column:
-            raise HTTPException(status_code=404, detail="Column not found")
+    async def unarchived_column(self, column_id: int, user_id: int) -> Column:
+        column = await self._get_column(column_id)
 
-        self._check_board_member(column.board_id, user_id=user_id)
+        await self._check_board_member(column.board_id, user_id=user_id)
 
         if not column.is_archived:
             raise HTTPException(
@@ -183,9 +207,10 @@ class ColumnService:
 
         try:
             column.is_archived = False
-            self.db.commit()
-            self.db.refresh(column)
-            return column
+            await bump_board_version_async(self.db, column.board_id)
+            await record_event(self.db, "column.restored", column.board_id, user_id, column_id=column_id)
+            await self.db.commit()
+            return await self._get_column(column_id, with_cards=True)
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to restore column: {str(e)}")
\ No newline at end of file
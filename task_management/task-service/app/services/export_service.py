@@ -0,0 +1,76 @@
+import json
+from datetime import datetime
+from typing import Iterator
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+from ..models.task import Board, BoardMember, Column, Card, Label, CardAssignment, card_labels
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _export_queries(board_id: int) -> list[tuple[str, object]]:
+    board_columns = select(Column.id).where(Column.board_id == board_id)
+    board_cards = select(Card.id).where(Card.column_id.in_(board_columns))
+
+    return [
+        ("board", select(
+            Board.id, Board.title, Board.visibility, Board.background, Board.is_closed,
+            Board.created_at, Board.updated_at
+        ).where(Board.id == board_id)),
+        ("member", select(
+            BoardMember.user_id, BoardMember.role, BoardMember.joined_at
+        ).where(BoardMember.board_id == board_id)),
+        ("label", select(
+            Label.id, Label.title, Label.color
+        ).where(Label.board_id == board_id).order_by(Label.id)),
+        ("column", select(
+            Column.id, Column.title, Column.position, Column.is_archived,
+            Column.created_at, Column.updated_at
+        ).where(Column.board_id == board_id).order_by(Column.position)),
+        ("card", select(
+            Card.id, Card.column_id, Card.title, Card.description, Card.position, Card.is_archived,
+            Card.created_at, Card.updated_at
+        ).where(Card.column_id.in_(board_columns)).order_by(Card.column_id, Card.position)),
+        ("card_label", select(
+            card_labels.c.card_id, card_labels.c.label_id
+        ).where(card_labels.c.card_id.in_(board_cards))),
+        ("assignment", select(
+            CardAssignment.card_id, CardAssignment.user_id, CardAssignment.role, CardAssignment.assigned_at
+        ).where(CardAssignment.card_id.in_(board_cards))),
+    ]
+
+
+def stream_board_ndjson(board_id: int) -> Iterator[bytes]:
+    """
+    Xuất toàn bộ board dưới dạng NDJSON, mỗi dòng một object có trường `type`
+    (board, member, label, column, card, card_label, assignment).
+
+    Dùng session riêng (router đóng request session trước khi stream),
+    đọc bằng server-side cursor theo lô EXPORT_BATCH_SIZE dòng trong một
+    transaction REPEATABLE READ để các truy vấn thấy cùng một snapshot.
+    """
+    db: Session = SessionLocal()
+    try:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        for record_type, stmt in _export_queries(board_id):
+            result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            for partition in result.mappings().partitions():
+                yield b"".join(
+                    json.dumps({"type": record_type, **row}, default=_json_default).encode() + b"\n"
+                    for row in partition
+                )
+    except Exception as e:
+        logger.error(f"Error exporting board {board_id}: {e}")
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,171 @@
+"""
+Khoá sắp xếp dạng chuỗi (fractional indexing, tương tự LexoRank).
+
+Mỗi key gồm phần nguyên có độ dài thay đổi (ký tự đầu mã hoá độ dài: 'a'..'z'
+cho số dương, 'A'..'Z' cho số âm) và phần thập phân base-62. So sánh chuỗi
+theo byte (collation "C") cho đúng thứ tự, luôn có thể sinh key nằm giữa hai
+key bất kỳ mà không cần đánh số lại các phần tử khác.
+
+Port từ thuật toán "Implementing Fractional Indexing" (David Greenspan).
+"""
+
+from typing import Optional
+
+BASE_62_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_ZERO = BASE_62_DIGITS[0]
+_SMALLEST_INTEGER = "A" + _ZERO * 26
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    # a, b là phần thập phân: a < b, không kết thúc bằng chữ số 0; b=None nghĩa là +vô cùng
+    if b is not None:
+        n = 0
+        while (a[n] if n < len(a) else _ZERO) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = BASE_62_DIGITS.index(a[0]) if a else 0
+    digit_b = BASE_62_DIGITS.index(b[0]) if b is not None else len(BASE_62_DIGITS)
+
+    if digit_b - digit_a > 1:
+        return BASE_62_DIGITS[(digit_a + digit_b + 1) // 2]
+
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return BASE_62_DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"Invalid order key head: {head!r}")
+
+
+def _integer_part(key: str) -> str:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"Invalid order key: {key!r}")
+    return key[:length]
+
+
+def validate_order_key(key: str) -> None:
+    if key == _SMALLEST_INTEGER:
+        raise ValueError(f"Invalid order key: {key!r}")
+    integer = _integer_part(key)
+    if key[len(integer):].endswith(_ZERO):
+        raise ValueError(f"Invalid order key: {key!r}")
+
+
+def _increment_integer(x: str) -> Optional[str]:
+    head, digits = x[0], list(x[1:])
+    for i in reversed(range(len(digits))):
+        d = BASE_62_DIGITS.index(digits[i]) + 1
+        if d == len(BASE_62_DIGITS):
+            digits[i] = _ZERO
+        else:
+            digits[i] = BASE_62_DIGITS[d]
+            return head + "".join(digits)
+
+    if head == "Z":
+        return "a" + _ZERO
+    if head == "z":
+        return None
+    new_head = chr(ord(head) + 1)
+    if new_head > "a":
+        digits.append(_ZERO)
+    else:
+        digits.pop()
+    return new_head + "".join(digits)
+
+
+def _decrement_integer(x: str) -> Optional[str]:
+    head, digits = x[0], list(x[1:])
+    for i in reversed(range(len(digits))):
+        d = BASE_62_DIGITS.index(digits[i]) - 1
+        if d == -1:
+            digits[i] = BASE_62_DIGITS[-1]
+        else:
+            digits[i] = BASE_62_DIGITS[d]
+            return head + "".join(digits)
+
+    if head == "a":
+        return "Z" + BASE_62_DIGITS[-1]
+    if head == "A":
+        return None
+    new_head = chr(ord(head) - 1)
+    if new_head < "Z":
+        digits.append(BASE_62_DIGITS[-1])
+    else:
+        digits.pop()
+    return new_head + "".join(digits)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """Sinh key nằm giữa a và b (None = đầu / cuối danh sách)."""
+    if a is not None:
+        validate_order_key(a)
+    if b is not None:
+        validate_order_key(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Order keys out of order: {a!r} >= {b!r}")
+
+    if a is None:
+        if b is None:
+            return "a" + _ZERO
+        int_b = _integer_part(b)
+        frac_b = b[len(int_b):]
+        if int_b == _SMALLEST_INTEGER:
+            return int_b + _midpoint("", frac_b)
+        if int_b < b:
+            return int_b
+        result = _decrement_integer(int_b)
+        if result is None:
+            raise ValueError("Cannot decrement any more")
+        return result
+
+    if b is None:
+        int_a = _integer_part(a)
+        frac_a = a[len(int_a):]
+        result = _increment_integer(int_a)
+        return int_a + _midpoint(frac_a, None) if result is None else result
+
+    int_a = _integer_part(a)
+    frac_a = a[len(int_a):]
+    int_b = _integer_part(b)
+    frac_b = b[len(int_b):]
+    if int_a == int_b:
+        return int_a + _midpoint(frac_a, frac_b)
+    result = _increment_integer(int_a)
+    if result is None:
+        raise ValueError("Cannot increment any more")
+    if result < b:
+        return result
+    return int_a + _midpoint(frac_a, None)
+
+
+def n_keys_between(a: Optional[str], b: Optional[str], n: int) -> list[str]:
+    """Sinh n key tăng dần nằm giữa a và b, phân bố đều để key ngắn nhất có thể."""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(a, b)]
+
+    if b is None:
+        keys = [key_between(a, None)]
+        for _ in range(n - 1):
+            keys.append(key_between(keys[-1], None))
+        return keys
+
+    if a is None:
+        keys = [key_between(None, b)]
+        for _ in range(n - 1):
+            keys.append(key_between(None, keys[-1]))
+        keys.reverse()
+        return keys
+
+    mid = n // 2
+    c = key_between(a, b)
+    return [*n_keys_between(a, c, mid), c, *n_keys_between(c, b, n - mid - 1)]
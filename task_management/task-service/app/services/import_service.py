@@ -0,0 +1,305 @@
+import csv
+import io
+from array import array
+from itertools import pairwise
+from typing import BinaryIO, Callable, Optional
+
+import ijson
+from fastapi import HTTPException
+from loguru import logger
+from sqlalchemy import Boolean, Integer, String, insert, update, values, column as sql_column
+from sqlalchemy.orm import Session
+from starlette import status
+
+from ..core.metrics import instrument_service
+from ..models.task import Board, BoardMember, Column, Card, Label, CardAssignment, card_labels
+from .fractional_index import key_between, n_keys_between
+
+IMPORT_BATCH_SIZE = 1000
+DEFAULT_LABEL_COLOR = "gray"
+
+# Các phần tử mảng cần đọc trong file export của Trello, phần còn lại (actions, checklists...) bị bỏ qua
+TRELLO_ITEM_PREFIXES = ("labels.item", "lists.item", "cards.item")
+
+
+@instrument_service
+class BoardImportService:
+    """
+    Import board từ file JSON (export của Trello) hoặc CSV theo kiểu streaming:
+    file được parse dần, card được ghi theo lô bằng multi-row INSERT,
+    nên bộ nhớ chỉ phụ thuộc vào batch_size và số column/label; với Trello thêm
+    `pos` và id của mỗi card (16 byte) để sắp lại thứ tự ở cuối.
+    Toàn bộ import nằm trong một transaction.
+
+    CSV: header gồm `column,title` và tuỳ chọn `description,labels,assignees,archived`
+    (labels là tên, assignees là user id, phân tách bằng `;`).
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        progress: Optional[Callable[[int], None]] = None
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.progress = progress
+
+        self.board_id: Optional[int] = None
+        self._columns: dict[str, int] = {}
+        self._labels: dict[str, int] = {}
+        self._last_keys: dict[int, Optional[str]] = {}
+        self._last_column_key: Optional[str] = None
+        # `pos` (Trello) và id của card theo column, theo thứ tự gặp trong file
+        self._card_pos: dict[int, array] = {}
+        self._card_ids: dict[int, array] = {}
+        self._member_ids: set[int] = set()
+        self._pending: list[tuple[dict, list[int], list[int]]] = []
+        self._counts = {"columns": 0, "cards": 0, "labels": 0, "assignments": 0}
+
+    def import_file(self, fileobj: BinaryIO, fmt: str, owner_id: int, title: Optional[str] = None) -> dict:
+        try:
+            self._create_board(title or "Imported board", owner_id)
+            if fmt == "csv":
+                self._import_csv(fileobj)
+            else:
+                self._import_trello(fileobj, keep_title=title is not None)
+            self._flush()
+            self._add_members(owner_id)
+            self.db.commit()
+        except (ijson.JSONError, csv.Error, UnicodeDecodeError, ValueError, KeyError) as e:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid import file: {e}")
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error importing board: {e}")
+            raise HTTPException(status_code=500, detail="Failed to import board")
+
+        logger.info(f"User {owner_id} imported board {self.board_id}: {self._counts}")
+        return {"board_id": self.board_id, **self._counts}
+
+    # --- Trello JSON ---
+
+    def _import_trello(self, fileobj: BinaryIO, keep_title: bool) -> None:
+        lists_meta: dict[str, tuple[str, bool, float]] = {}
+        builder = None
+        builder_prefix = None
+
+        for prefix, event, value in ijson.parse(fileobj):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == builder_prefix and event == "end_map":
+                    self._handle_trello_item(builder_prefix, builder.value, lists_meta)
+                    builder = None
+                continue
+
+            if prefix in TRELLO_ITEM_PREFIXES and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                builder_prefix = prefix
+            elif prefix == "name" and event == "string" and not keep_title:
+                self.db.query(Board).filter(Board.id == self.board_id).update({Board.title: value})
+
+        self._finalize_trello_lists(lists_meta)
+        self._flush()
+        self._order_trello_cards()
+
+    def _handle_trello_item(self, prefix: str, item: dict, lists_meta: dict) -> None:
+        if prefix == "labels.item":
+            label_id = self._label_id(item["id"])
+            self.db.query(Label).filter(Label.id == label_id).update({
+                Label.title: item.get("name") or None,
+                Label.color: item.get("color") or DEFAULT_LABEL_COLOR
+            })
+        elif prefix == "lists.item":
+            self._column_id(item["id"])
+            lists_meta[item["id"]] = (item.get("name") or "", bool(item.get("closed")), float(item.get("pos") or 0))
+        else:
+            self._add_card(
+                column_id=self._column_id(item["idList"]),
+                title=item.get("name") or "",
+                description=item.get("desc") or None,
+                is_archived=bool(item.get("closed")),
+                label_ids=[self._label_id(label_id) for label_id in item.get("idLabels") or []],
+                # idMembers của Trello không map được sang user id của hệ thống
+                assignee_ids=[],
+                pos=float(item.get("pos") or 0)
+            )
+
+    def _finalize_trello_lists(self, lists_meta: dict) -> None:
+        # Column được tạo khi gặp lần đầu (card có thể đứng trước list trong file),
+        # cập nhật title / trạng thái / thứ tự theo `pos` của Trello ở cuối
+        ordered = sorted(lists_meta.items(), key=lambda entry: entry[1][2])
+        if not ordered:
+            return
+
+        keys = n_keys_between(None, None, len(ordered))
+        rows = [
+            (self._columns[list_id], name, closed, key)
+            for (list_id, (name, closed, _)), key in zip(ordered, keys)
+        ]
+        changes = values(
+            sql_column("id", Integer),
+            sql_column("title", String),
+            sql_column("is_archived", Boolean),
+            sql_column("position", String),
+            name="changes"
+        ).data(rows)
+        self.db.execute(
+            update(Column)
+            .where(Column.id == changes.c.id)
+            .values(title=changes.c.title, is_archived=changes.c.is_archived, position=changes.c.position)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _order_trello_cards(self) -> None:
+        # Card nhận key theo thứ tự trong file; column có `pos` không tăng dần thì gán lại
+        # key theo `pos` (hoà nhau giữ thứ tự trong file), ghi theo lô UPDATE ... FROM (VALUES ...)
+        for column_id, positions in self._card_pos.items():
+            if all(a <= b for a, b in pairwise(positions)):
+                continue
+
+            card_ids = self._card_ids[column_id]
+            order = sorted(range(len(positions)), key=positions.__getitem__)
+            keys = n_keys_between(None, None, len(order))
+            rows = [(card_ids[i], key) for i, key in zip(order, keys)]
+            for start in range(0, len(rows), self.batch_size):
+                changes = values(
+                    sql_column("id", Integer),
+                    sql_column("position", String),
+                    name="changes"
+                ).data(rows[start:start + self.batch_size])
+                self.db.execute(
+                    update(Card)
+                    .where(Card.id == changes.c.id)
+                    .values(position=changes.c.position)
+                    .execution_options(synchronize_session=False)
+                )
+
+    # --- CSV ---
+
+    def _import_csv(self, fileobj: BinaryIO) -> None:
+        reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+        if not reader.fieldnames or not {"column", "title"} <= set(reader.fieldnames):
+            raise ValueError("CSV header must contain 'column' and 'title'")
+
+        for row in reader:
+            self._add_card(
+                column_id=self._column_id(row["column"]),
+                title=row["title"],
+                description=row.get("description") or None,
+                is_archived=(row.get("archived") or "").strip().lower() in ("1", "true", "yes"),
+                label_ids=[self._label_id(name, title=name) for name in _split(row.get("labels"))],
+                assignee_ids=[int(user_id) for user_id in _split(row.get("assignees"))]
+            )
+
+    # --- Ghi dữ liệu ---
+
+    def _create_board(self, title: str, owner_id: int) -> None:
+        self.board_id = self.db.execute(
+            insert(Board).values(title=title, owner_id=owner_id).returning(Board.id)
+        ).scalar_one()
+        self.db.execute(insert(BoardMember).values(board_id=self.board_id, user_id=owner_id, role="admin"))
+
+    def _column_id(self, ref: str) -> int:
+        column_id = self._columns.get(ref)
+        if column_id is None:
+            position = key_between(self._last_column_key, None)
+            self._last_column_key = position
+            column_id = self.db.execute(
+                insert(Column)
+                .values(title=ref, board_id=self.board_id, position=position)
+                .returning(Column.id)
+            ).scalar_one()
+            self._columns[ref] = column_id
+            self._counts["columns"] += 1
+        return column_id
+
+    def _label_id(self, ref: str, title: Optional[str] = None) -> int:
+        label_id = self._labels.get(ref)
+        if label_id is None:
+            label_id = self.db.execute(
+                insert(Label)
+                .values(title=title, color=DEFAULT_LABEL_COLOR, board_id=self.board_id)
+                .returning(Label.id)
+            ).scalar_one()
+            self._labels[ref] = label_id
+            self._counts["labels"] += 1
+        return label_id
+
+    def _add_card(
+        self,
+        column_id: int,
+        title: str,
+        description: Optional[str],
+        is_archived: bool,
+        label_ids: list[int],
+        assignee_ids: list[int],
+        pos: Optional[float] = None
+    ) -> None:
+        position = key_between(self._last_keys.get(column_id), None)
+        self._last_keys[column_id] = position
+        if pos is not None:
+            self._card_pos.setdefault(column_id, array("d")).append(pos)
+        row = {
+            "title": title,
+            "description": description,
+            "column_id": column_id,
+            "position": position,
+            "is_archived": is_archived
+        }
+        self._pending.append((row, label_ids, assignee_ids))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+
+        card_ids = self.db.execute(
+            insert(Card).returning(Card.id, sort_by_parameter_order=True),
+            [row for row, _, _ in self._pending]
+        ).scalars().all()
+
+        for card_id, (row, _, _) in zip(card_ids, self._pending):
+            if row["column_id"] in self._card_pos:
+                self._card_ids.setdefault(row["column_id"], array("q")).append(card_id)
+
+        label_rows = [
+            {"card_id": card_id, "label_id": label_id}
+            for card_id, (_, label_ids, _) in zip(card_ids, self._pending)
+            for label_id in set(label_ids)
+        ]
+        assignment_rows = [
+            {"card_id": card_id, "user_id": user_id, "role": "member"}
+            for card_id, (_, _, assignee_ids) in zip(card_ids, self._pending)
+            for user_id in set(assignee_ids)
+        ]
+        if label_rows:
+            self.db.execute(insert(card_labels), label_rows)
+        if assignment_rows:
+            self.db.execute(insert(CardAssignment), assignment_rows)
+            self._member_ids.update(row["user_id"] for row in assignment_rows)
+
+        self._counts["cards"] += len(card_ids)
+        self._counts["assignments"] += len(assignment_rows)
+        self._pending.clear()
+
+        if self.progress:
+            self.progress(self._counts["cards"])
+
+    def _add_members(self, owner_id: int) -> None:
+        # Người được assign phải là member của board
+        member_rows = [
+            {"board_id": self.board_id, "user_id": user_id, "role": "member"}
+            for user_id in self._member_ids - {owner_id}
+        ]
+        if member_rows:
+            self.db.execute(insert(BoardMember), member_rows)
+
+
+def _split(value: Optional[str]) -> list[str]:
+    return [part.strip() for part in (value or "").split(";") if part.strip()]
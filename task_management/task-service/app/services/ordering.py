@@ -0,0 +1,89 @@
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from ..core.tracing import traced
+
+
+class NeighborPositions(NamedTuple):
+    prev: Optional[str]
+    next: Optional[str]
+    # Gặp các phần tử trùng key quanh vị trí đích: scope cần được rebalance
+    has_ties: bool = False
+
+
+@traced("ordering.find_neighbor_positions")
+async def find_neighbor_positions(
+    db: AsyncSession,
+    model,
+    scope,
+    exclude_id: int,
+    new_index: Optional[int] = None,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+) -> NeighborPositions:
+    """
+    Tìm position của phần tử liền trước / liền sau vị trí đích trong `scope`
+    (vd. Card.column_id == 1) mà không load toàn bộ danh sách anh em.
+
+    - after_id / before_id: neo theo một phần tử có sẵn, 2 truy vấn index (O(log n)).
+      Đây là cách client nên dùng.
+    - new_index (deprecated): chỉ trả về 2 giá trị position, nhưng OFFSET vẫn phải đi qua
+      new_index entry của index, nên chi phí tăng theo vị trí đích. Giữ cho client cũ.
+    Phần tử đang di chuyển (`exclude_id`) và các phần tử đã archive bị bỏ qua.
+    Luôn trả về prev < next. Gọi sau khi đã khoá board (bump_board_version_async),
+    để không có thao tác ghi nào khác đổi key giữa lúc đọc và lúc ghi.
+    """
+    siblings = select(model.position).where(
+        scope,
+        model.id != exclude_id,
+        model.is_archived == False
+    )
+
+    if after_id is not None or before_id is not None:
+        anchor_id = after_id if after_id is not None else before_id
+        anchor = await db.scalar(siblings.where(model.id == anchor_id))
+        if anchor is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Anchor item not found in the target list"
+            )
+        if after_id is not None:
+            next_pos = await db.scalar(
+                siblings.where(model.position > anchor)
+                .order_by(model.position.asc()).limit(1)
+            )
+            return NeighborPositions(anchor, next_pos)
+        prev_pos = await db.scalar(
+            siblings.where(model.position < anchor)
+            .order_by(model.position.desc()).limit(1)
+        )
+        return NeighborPositions(prev_pos, anchor)
+
+    target_index = max(new_index or 0, 0)
+    if target_index == 0:
+        return NeighborPositions(None, await db.scalar(siblings.order_by(model.position.asc()).limit(1)))
+
+    positions = (await db.scalars(
+        siblings.order_by(model.position.asc())
+        .offset(target_index - 1)
+        .limit(2)
+    )).all()
+    if len(positions) == 2:
+        prev_pos, next_pos = positions
+        if prev_pos >= next_pos:
+            # Hai phần tử trùng key (dữ liệu cũ): đặt sau cả nhóm trùng, rebalance sẽ tách chúng ra
+            next_pos = await db.scalar(
+                siblings.where(model.position > prev_pos)
+                .order_by(model.position.asc()).limit(1)
+            )
+            return NeighborPositions(prev_pos, next_pos, has_ties=True)
+        return NeighborPositions(prev_pos, next_pos)
+    if len(positions) == 1:
+        return NeighborPositions(positions[0], None)
+
+    # new_index vượt quá cuối danh sách -> đặt sau phần tử cuối cùng
+    return NeighborPositions(await db.scalar(siblings.order_by(model.position.desc()).limit(1)), None)
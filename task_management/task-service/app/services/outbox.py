@@ -0,0 +1,210 @@
+# task_management/task-service/app/services/outbox.py
+
+import asyncio
+import json
+from typing import Iterable, Optional
+
+from aiokafka import AIOKafkaProducer
+from loguru import logger
+from opentelemetry.propagate import inject
+from prometheus_client import Counter
+from sqlalchemy import delete, event as sa_event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.metrics import current_operation
+from ..core.realtime import board_event_hub, sse_frame
+from ..core.tracing import tracer
+from ..db import AsyncSessionLocal
+from ..db.routing import RoutingSession
+from ..models.task import OutboxEvent
+
+OUTBOX_PUBLISHED = Counter(
+    "task_outbox_events_published_total",
+    "Domain events published from the outbox to Kafka",
+)
+OUTBOX_PUBLISH_FAILURES = Counter(
+    "task_outbox_publish_failures_total",
+    "Outbox batches that failed to publish and will be retried",
+)
+
+# Event của transaction đang mở, chờ gửi realtime sau commit
+_PENDING_REALTIME = "pending_realtime_events"
+
+# Khoá advisory (transaction-level) cho relay: nhiều worker cùng chạy nhưng mỗi lô chỉ một relay publish
+_RELAY_LOCK_KEY = 0x7461736B  # "task"
+
+
+def event(event_type: str, board_id: int, actor_id: Optional[int] = None, **payload) -> dict:
+    """Một dòng outbox: `payload` là các field của event (chỉ kiểu JSON)."""
+    return {"event_type": event_type, "board_id": board_id, "actor_id": actor_id, "payload": payload}
+
+
+async def record_events(db: AsyncSession, events: Iterable[dict]) -> None:
+    """
+    Ghi domain event vào outbox trong transaction hiện tại, relay publish sau khi commit.
+
+    Gọi SAU bump_board_version_async (hoặc lock_board_async nếu nội dung board không đổi):
+    khoá dòng board được giữ tới commit, nên id của các event cùng board tăng đúng theo
+    thứ tự commit và relay publish đúng thứ tự đó.
+    Sau commit, event cũng được đẩy ngay tới các kết nối realtime của board.
+    """
+    rows = list(events)
+    if not rows:
+        return
+
+    trace_context: dict = {}
+    inject(trace_context)
+    for row in rows:
+        row["trace_context"] = trace_context or None
+
+    inserted = (await db.execute(
+        insert(OutboxEvent).returning(OutboxEvent.id, OutboxEvent.created_at, sort_by_parameter_order=True),
+        rows
+    )).all()
+
+    pending = db.info.setdefault(_PENDING_REALTIME, [])
+    for row, (event_id, created_at) in zip(rows, inserted):
+        message = _message(event_id, row["event_type"], row["board_id"], row["actor_id"], created_at, row["payload"])
+        pending.append((row["board_id"], sse_frame(event_id, row["event_type"], message)))
+
+
+async def record_event(db: AsyncSession, event_type: str, board_id: int, actor_id: Optional[int] = None, **payload) -> None:
+    await record_events(db, [event(event_type, board_id, actor_id, **payload)])
+
+
+@sa_event.listens_for(RoutingSession, "after_commit")
+def _publish_realtime(session: Session) -> None:
+    board_event_hub.publish_nowait(session.info.pop(_PENDING_REALTIME, []))
+
+
+@sa_event.listens_for(RoutingSession, "after_rollback")
+def _discard_realtime(session: Session) -> None:
+    session.info.pop(_PENDING_REALTIME, None)
+
+
+def _message(event_id: int, event_type: str, board_id: int, actor_id: Optional[int], created_at, payload: dict) -> str:
+    """JSON của một event, dùng chung cho Kafka và realtime."""
+    return json.dumps({
+        "id": event_id,
+        "event": event_type,
+        "board_id": board_id,
+        "actor_id": actor_id,
+        "occurred_at": created_at.isoformat(),
+        "payload": payload,
+    }, default=str)
+
+
+class OutboxRelay:
+    """
+    Background task publish outbox_events lên Kafka theo lô, theo thứ tự id.
+
+    Key của message là board_id: event cùng board vào cùng partition nên consumer nhận
+    đúng thứ tự. Producer idempotent, nén theo lô (linger_ms). Delivery là at-least-once:
+    lô lỗi giữa chừng được gửi lại, consumer khử trùng lặp theo `id`.
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._producer: Optional[AIOKafkaProducer] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if not settings.KAFKA_BOOTSTRAP_SERVERS:
+            logger.warning("KAFKA_BOOTSTRAP_SERVERS not set: outbox relay disabled")
+            return
+        self._task = asyncio.create_task(self._run(), name="outbox-relay")
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _start_producer(self) -> None:
+        producer = AIOKafkaProducer(
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            compression_type=settings.KAFKA_COMPRESSION_TYPE,
+            linger_ms=settings.KAFKA_LINGER_MS,
+            enable_idempotence=True,
+        )
+        await producer.start()
+        self._producer = producer
+        logger.success(f"Outbox relay connected to Kafka at {settings.KAFKA_BOOTSTRAP_SERVERS}")
+
+    async def _run(self) -> None:
+        current_operation.set("OutboxRelay.publish_batch")
+        try:
+            while True:
+                published = 0
+                try:
+                    if self._producer is None:
+                        await self._start_producer()
+                    published = await self.publish_batch()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    OUTBOX_PUBLISH_FAILURES.inc()
+                    logger.error(f"Outbox relay failed, retrying: {e}")
+                    await self._stop_producer()
+                    await asyncio.sleep(5)
+
+                # Lô đầy: còn event tồn, publish tiếp ngay
+                if published < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            await self._stop_producer()
+
+    async def _stop_producer(self) -> None:
+        # Producer lỗi (vd. mất sequence idempotent) được tạo lại ở vòng sau
+        if self._producer is not None:
+            producer, self._producer = self._producer, None
+            try:
+                await producer.stop()
+            except Exception as e:
+                logger.warning(f"Failed to stop Kafka producer: {e}")
+
+    async def publish_batch(self) -> int:
+        """Publish một lô event cũ nhất rồi xoá khỏi outbox, trả về số event đã gửi."""
+        async with AsyncSessionLocal() as db, db.begin():
+            if not await db.scalar(select(func.pg_try_advisory_xact_lock(_RELAY_LOCK_KEY))):
+                return 0
+
+            rows = (await db.scalars(
+                select(OutboxEvent).order_by(OutboxEvent.id.asc()).limit(self.batch_size)
+            )).all()
+            if not rows:
+                return 0
+
+            with tracer.start_as_current_span("outbox.publish_batch") as span:
+                span.set_attribute("outbox.batch_size", len(rows))
+                # send() chỉ xếp message vào lô của producer; chờ tất cả ack rồi mới xoá
+                deliveries = []
+                for row in rows:
+                    headers = [("event", row.event_type.encode())]
+                    headers += [(k, v.encode()) for k, v in (row.trace_context or {}).items()]
+                    deliveries.append(await self._producer.send(
+                        settings.KAFKA_TASK_EVENTS_TOPIC,
+                        value=_message(
+                            row.id, row.event_type, row.board_id, row.actor_id, row.created_at, row.payload
+                        ).encode(),
+                        key=str(row.board_id).encode(),
+                        headers=headers,
+                    ))
+                await asyncio.gather(*deliveries)
+
+            await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])))
+
+        OUTBOX_PUBLISHED.inc(len(rows))
+        return len(rows)
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+)
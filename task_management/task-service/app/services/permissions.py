@@ -0,0 +1,58 @@
+from typing import Optional
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.acl_cache import acl_cache
+from ..core.tracing import traced
+from ..models.task import BoardMember, Column
+
+
+@traced("permissions.get_board_role")
+async def get_board_role(db: AsyncSession, board_id: int, user_id: int) -> Optional[str]:
+    """Role của user trên board (None nếu không phải member), ưu tiên đọc từ ACL cache."""
+    role = acl_cache.get_role(user_id, board_id)
+    if role is not None:
+        return role
+
+    role = await db.scalar(
+        select(BoardMember.role)
+        .where(
+            BoardMember.board_id == board_id,
+            BoardMember.user_id == user_id
+        )
+    )
+    if role is not None:
+        acl_cache.set_role(user_id, board_id, role)
+    return role
+
+
+@traced("permissions.get_column_access")
+async def get_column_access(db: AsyncSession, column_id: int, user_id: int) -> tuple[Optional[int], Optional[str]]:
+    """
+    Trả về (board_id, role) của user trên board chứa column.
+    board_id là None nếu column không tồn tại, role là None nếu user không phải member.
+    """
+    board_id = acl_cache.get_column_board(column_id)
+    if board_id is not None:
+        return board_id, await get_board_role(db, board_id, user_id)
+
+    row = (await db.execute(
+        select(Column.board_id, BoardMember.role)
+        .outerjoin(
+            BoardMember,
+            and_(
+                BoardMember.board_id == Column.board_id,
+                BoardMember.user_id == user_id
+            )
+        )
+        .where(Column.id == column_id)
+    )).first()
+    if row is None:
+        return None, None
+
+    board_id, role = row
+    acl_cache.set_column_board(column_id, board_id)
+    if role is not None:
+        acl_cache.set_role(user_id, board_id, role)
+    return board_id, role
@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+from sqlalchemy import Integer, String, select, update, values, column as sql_column
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.metrics import current_operation
+from ..db import SessionLocal
+from ..models.task import Card, Column
+from .board_version import bump_board_version
+from .fractional_index import n_keys_between
+
+
+def rebalance_card_keys(db: Session, column_id: int) -> int:
+    """Cấp lại key ngắn, phân bố đều cho toàn bộ card trong column (giữ nguyên thứ tự)."""
+    # Tăng version trước khi ghi: trigger gán sync_version của card theo version mới
+    board_id = db.query(Column.board_id).filter(Column.id == column_id).scalar()
+    bump_board_version(db, board_id)
+
+    card_ids = db.execute(
+        select(Card.id)
+        .where(Card.column_id == column_id)
+        .order_by(Card.position.asc(), Card.id.asc())
+        .with_for_update()
+    ).scalars().all()
+
+    _bulk_set_positions(db, Card, card_ids)
+    return len(card_ids)
+
+
+def rebalance_column_keys(db: Session, board_id: int) -> int:
+    """Cấp lại key cho toàn bộ column trong board (giữ nguyên thứ tự)."""
+    bump_board_version(db, board_id)
+
+    column_ids = db.execute(
+        select(Column.id)
+        .where(Column.board_id == board_id)
+        .order_by(Column.position.asc(), Column.id.asc())
+        .with_for_update()
+    ).scalars().all()
+
+    _bulk_set_positions(db, Column, column_ids)
+    return len(column_ids)
+
+
+def _bulk_set_positions(db: Session, model, ids: list[int]) -> None:
+    if not ids:
+        return
+
+    # UPDATE ... FROM (VALUES ...): một câu lệnh cho cả danh sách
+    new_positions = values(
+        sql_column("id", Integer),
+        sql_column("position", String),
+        name="new_positions"
+    ).data(list(zip(ids, n_keys_between(None, None, len(ids)))))
+
+    db.execute(
+        update(model)
+        .where(model.id == new_positions.c.id)
+        .values(position=new_positions.c.position)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class OrderKeyRebalancer:
+    """
+    Chạy rebalance ở background thread khi key sắp xếp trở nên quá dài
+    (do chèn lặp lại vào cùng một vị trí). Mỗi scope chỉ có tối đa một job chờ.
+    """
+
+    def __init__(self, max_key_length: int):
+        self.max_key_length = max_key_length
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="order-key-rebalancer")
+        self._pending: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def schedule_if_needed(self, kind: str, scope_id: int, key: str) -> None:
+        if len(key) > self.max_key_length:
+            self.schedule(kind, scope_id)
+
+    def schedule(self, kind: str, scope_id: int) -> None:
+        """Lên lịch rebalance ngay, vd. khi phát hiện các phần tử trùng key trong scope."""
+        job = (kind, scope_id)
+        with self._lock:
+            if job in self._pending:
+                return
+            self._pending.add(job)
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: tuple[str, int]) -> None:
+        kind, scope_id = job
+        with self._lock:
+            self._pending.discard(job)
+
+        current_operation.set(f"OrderKeyRebalancer.{kind}")
+        db = SessionLocal()
+        try:
+            if kind == "card":
+                count = rebalance_card_keys(db, column_id=scope_id)
+            else:
+                count = rebalance_column_keys(db, board_id=scope_id)
+            db.commit()
+            logger.info(f"Rebalanced {count} {kind} order keys in scope {scope_id}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to rebalance {kind} order keys in scope {scope_id}: {e}")
+        finally:
+            db.close()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+order_key_rebalancer = OrderKeyRebalancer(max_key_length=settings.ORDER_KEY_MAX_LENGTH)
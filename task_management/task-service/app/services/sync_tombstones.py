@@ -0,0 +1,86 @@
+import asyncio
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.metrics import current_operation
+from ..db import SessionLocal
+from ..models.task import Board, SyncTombstone
+
+
+def prune_tombstone_chunk(db: Session, keep_versions: int, chunk_size: int) -> int:
+    """
+    Xoá tối đa `chunk_size` tombstone cũ hơn `keep_versions` version so với version
+    hiện tại của board. GET /boards/{id}/changes trả về reset với `since` cũ hơn mốc đó.
+    """
+    expired = (
+        select(SyncTombstone.id)
+        .join(Board, Board.id == SyncTombstone.board_id)
+        .where(SyncTombstone.version <= Board.version - keep_versions)
+        .limit(chunk_size)
+        .scalar_subquery()
+    )
+    return db.execute(delete(SyncTombstone).where(SyncTombstone.id.in_(expired))).rowcount
+
+
+class SyncTombstonePruner:
+    """
+    Background task xoá định kỳ tombstone của delta sync mà không client nào cần nữa
+    (xem BOARD_SYNC_TOMBSTONE_VERSIONS), từng lô một transaction. Chỉ đọc boards, không
+    khoá dòng board, nên không chặn các thao tác ghi.
+    """
+
+    def __init__(self, keep_versions: int, chunk_size: int, interval: float):
+        self.keep_versions = keep_versions
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="sync-tombstone-pruner")
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                deleted = await asyncio.to_thread(self.prune)
+                if deleted:
+                    logger.info(f"Pruned {deleted} sync tombstones")
+            except Exception as e:
+                logger.error(f"Failed to prune sync tombstones, retrying: {e}")
+            await asyncio.sleep(self.interval)
+
+    def prune(self) -> int:
+        current_operation.set("SyncTombstonePruner.prune")
+        db = SessionLocal()
+        deleted = 0
+        try:
+            while True:
+                count = prune_tombstone_chunk(db, self.keep_versions, self.chunk_size)
+                db.commit()
+                deleted += count
+                if count < self.chunk_size:
+                    return deleted
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+sync_tombstone_pruner = SyncTombstonePruner(
+    keep_versions=settings.BOARD_SYNC_TOMBSTONE_VERSIONS,
+    chunk_size=settings.BOARD_SYNC_TOMBSTONE_PRUNE_CHUNK_SIZE,
+    interval=settings.BOARD_SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS,
+)
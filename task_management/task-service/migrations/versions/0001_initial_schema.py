@@ -0,0 +1,132 @@
+"""Initial schema (tương đương Base.metadata.create_all của bản đầu tiên)
+
+Schema gốc: position dạng float, boards chưa có cột version. Database đã được tạo
+bằng create_all được stamp 0001_initial_schema rồi `alembic upgrade head` (0002 chuyển
+position sang key chuỗi và thêm boards.version): `python -m app.db.migrate` lúc container
+khởi động tự làm việc này, hoặc chạy tay `alembic stamp 0001_initial_schema` một lần.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001_initial_schema"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "boards",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "visibility",
+            sa.Enum("PRIVATE", "PUBLIC", "WORKSPACE", "ORGANIZATION", name="boardvisibility"),
+            nullable=False
+        ),
+        sa.Column("background", sa.String(), nullable=True),
+        sa.Column("is_closed", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_boards_id", "boards", ["id"])
+    op.create_index("ix_boards_owner_id", "boards", ["owner_id"])
+
+    op.create_table(
+        "board_members",
+        sa.Column("board_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("joined_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["board_id"], ["boards.id"]),
+        sa.PrimaryKeyConstraint("board_id", "user_id"),
+    )
+
+    op.create_table(
+        "labels",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("color", sa.String(), nullable=False),
+        sa.Column("board_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["board_id"], ["boards.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_labels_id", "labels", ["id"])
+
+    op.create_table(
+        "columns",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("position", sa.Float(), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=True),
+        sa.Column("board_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["board_id"], ["boards.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_columns_id", "columns", ["id"])
+    op.create_index("ix_columns_board_id", "columns", ["board_id"])
+
+    op.create_table(
+        "cards",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("position", sa.Float(), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=True),
+        sa.Column("column_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["column_id"], ["columns.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_cards_id", "cards", ["id"])
+    op.create_index("ix_cards_column_id", "cards", ["column_id"])
+
+    op.create_table(
+        "card_assignments",
+        sa.Column("card_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("assigned_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["card_id"], ["cards.id"]),
+        sa.PrimaryKeyConstraint("card_id", "user_id"),
+    )
+
+    op.create_table(
+        "card_labels",
+        sa.Column("card_id", sa.Integer(), nullable=False),
+        sa.Column("label_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["card_id"], ["cards.id"]),
+        sa.ForeignKeyConstraint(["label_id"], ["labels.id"]),
+        sa.PrimaryKeyConstraint("card_id", "label_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("card_labels")
+    op.drop_table("card_assignments")
+    op.drop_index("ix_cards_column_id", table_name="cards")
+    op.drop_index("ix_cards_id", table_name="cards")
+    op.drop_table("cards")
+    op.drop_index("ix_columns_board_id", table_name="columns")
+    op.drop_index("ix_columns_id", table_name="columns")
+    op.drop_table("columns")
+    op.drop_index("ix_labels_id", table_name="labels")
+    op.drop_table("labels")
+    op.drop_table("board_members")
+    op.drop_index("ix_boards_owner_id", table_name="boards")
+    op.drop_index("ix_boards_id", table_name="boards")
+    op.drop_table("boards")
+    sa.Enum(name="boardvisibility").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,87 @@
+"""Key sắp xếp dạng chuỗi cho cards / columns và boards.version
+
+- boards.version: tăng mỗi khi nội dung board thay đổi (khoá cache, ETag, delta sync)
+- cards.position, columns.position: float -> varchar COLLATE "C" (fractional index key,
+  xem app/services/fractional_index.py)
+
+Key được gán lại theo đúng thứ tự position cũ trong từng column / board (hoà nhau thì
+theo id): phần tử thứ n nhận key "c" + n viết bằng 3 chữ số base-62 ("c000", "c001", ...),
+tức key nguyên hợp lệ, tăng dần theo byte, đủ cho 238328 phần tử cùng scope.
+
+Database tạo bằng create_all sau khi model đã đổi (position đã là chuỗi, đã có version)
+cũng chạy được: thứ tự chuỗi được giữ nguyên, cột version đã có thì bỏ qua.
+
+Revision ID: 0002_string_order_keys
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002_string_order_keys"
+down_revision: Union[str, None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BASE_62_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+MAX_SCOPE_SIZE = 62 ** 3
+
+# (bảng, cột scope)
+ORDERED_TABLES = (("columns", "board_id"), ("cards", "column_id"))
+
+
+def _rank_key(rank: str) -> str:
+    # SQL: "c" + rank (0-based) viết bằng 3 chữ số base-62
+    return "'c' || " + " || ".join(
+        f"substr('{BASE_62_DIGITS}', ({rank} / {62 ** power}) % 62 + 1, 1)"
+        for power in (2, 1, 0)
+    )
+
+
+def _rank_positions(table: str, scope: str) -> None:
+    # Window function không dùng được trong USING của ALTER ... TYPE, nên thứ hạng được
+    # tính trước vào cột tạm, theo thứ tự position với kiểu dữ liệu hiện tại
+    op.execute(f"ALTER TABLE {table} ADD COLUMN position_rank integer")
+    op.execute(f"""
+        UPDATE {table} SET position_rank = ranked.rank
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY {scope} ORDER BY position, id) - 1 AS rank
+            FROM {table}
+        ) AS ranked
+        WHERE {table}.id = ranked.id
+    """)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE boards ADD COLUMN IF NOT EXISTS version integer DEFAULT 0 NOT NULL")
+
+    for table, scope in ORDERED_TABLES:
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM {table} GROUP BY {scope} HAVING count(*) > {MAX_SCOPE_SIZE}) THEN
+                    RAISE EXCEPTION '{table}: more than {MAX_SCOPE_SIZE} rows in one {scope}';
+                END IF;
+            END
+            $$
+        """)
+        _rank_positions(table, scope)
+        op.execute(f"""
+            ALTER TABLE {table}
+                ALTER COLUMN position DROP DEFAULT,
+                ALTER COLUMN position TYPE varchar COLLATE "C" USING {_rank_key("position_rank")}
+        """)
+        op.execute(f"ALTER TABLE {table} DROP COLUMN position_rank")
+
+
+def downgrade() -> None:
+    for table, scope in ORDERED_TABLES:
+        _rank_positions(table, scope)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN position TYPE float USING position_rank")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN position_rank")
+
+    op.execute("ALTER TABLE boards DROP COLUMN version")
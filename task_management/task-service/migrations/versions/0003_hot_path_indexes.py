@@ -0,0 +1,79 @@
+"""Composite / partial indexes cho các truy vấn nóng
+
+- cards(column_id, position, id) WHERE NOT is_archived: danh sách card đang hoạt
+  động của column theo thứ tự, phân trang keyset (get_cards_in_column, board detail)
+- cards(column_id, position): key cuối của column khi tạo / chuyển card,
+  thay cho index đơn cột cards(column_id)
+- columns(board_id, position): column của board theo thứ tự, thay cho columns(board_id)
+- board_members(user_id, board_id): "board của tôi"
+- card_assignments(user_id, card_id), card_labels(label_id, card_id): tra theo
+  user / label, phần tử thứ hai của primary key không dùng được cho việc này
+
+Index được tạo CONCURRENTLY (ngoài transaction) để không khoá ghi trên bảng lớn.
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_string_order_keys
+Create Date: 2026-10-18 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003_hot_path_indexes"
+down_revision: Union[str, None] = "0002_string_order_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # if_not_exists / if_exists: CONCURRENTLY không chạy trong transaction, nên có thể
+    # chạy lại an toàn nếu lần trước dừng giữa chừng
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_cards_active_column_id_position", "cards", ["column_id", "position", "id"],
+            postgresql_where=sa.text("NOT is_archived"), postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_cards_column_id_position", "cards", ["column_id", "position"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_columns_board_id_position", "columns", ["board_id", "position"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_board_members_user_id_board_id", "board_members", ["user_id", "board_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_card_assignments_user_id_card_id", "card_assignments", ["user_id", "card_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_card_labels_label_id_card_id", "card_labels", ["label_id", "card_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        # Đã được bao bởi các index composite ở trên (cùng cột đầu)
+        op.drop_index("ix_cards_column_id", table_name="cards", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_columns_board_id", table_name="columns", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_columns_board_id", "columns", ["board_id"], postgresql_concurrently=True)
+        op.create_index("ix_cards_column_id", "cards", ["column_id"], postgresql_concurrently=True)
+
+        op.drop_index("ix_card_labels_label_id_card_id", table_name="card_labels", postgresql_concurrently=True)
+        op.drop_index(
+            "ix_card_assignments_user_id_card_id", table_name="card_assignments", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_board_members_user_id_board_id", table_name="board_members", postgresql_concurrently=True
+        )
+        op.drop_index("ix_columns_board_id_position", table_name="columns", postgresql_concurrently=True)
+        op.drop_index("ix_cards_column_id_position", table_name="cards", postgresql_concurrently=True)
+        op.drop_index("ix_cards_active_column_id_position", table_name="cards", postgresql_concurrently=True)
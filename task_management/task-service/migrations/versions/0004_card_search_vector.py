@@ -0,0 +1,44 @@
+"""Full-text search cho card: cột generated tsvector + GIN index
+
+Thêm cột STORED generated sẽ ghi lại toàn bộ bảng cards (khoá ACCESS EXCLUSIVE
+trong lúc chạy): nên chạy ngoài giờ cao điểm với bảng lớn.
+
+Revision ID: 0004_card_search_vector
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-18 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0004_card_search_vector"
+down_revision: Union[str, None] = "0003_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "cards",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True))
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_cards_search_vector", "cards", ["search_vector"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_cards_search_vector", table_name="cards", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("cards", "search_vector")
@@ -0,0 +1,36 @@
+"""Bảng outbox_events cho domain event (transactional outbox)
+
+Revision ID: 0005_outbox_events
+Revises: 0004_card_search_vector
+Create Date: 2026-10-18 00:00:03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0005_outbox_events"
+down_revision: Union[str, None] = "0004_card_search_vector"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("board_id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=True),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("trace_context", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("outbox_events")
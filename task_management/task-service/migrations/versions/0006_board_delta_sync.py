@@ -0,0 +1,156 @@
+"""Delta sync cho board: cột sync_version, bảng sync_tombstones và các trigger
+
+Mỗi lần insert / update card hoặc column, trigger gán sync_version = Board.version
+hiện tại trong transaction. Service luôn tăng Board.version (và giữ khoá dòng board)
+trước khi ghi card / column, nên mọi dòng thay đổi trong một transaction mang đúng
+version transaction đó tạo ra. Xoá card / column (hoặc chuyển card sang board khác)
+để lại tombstone với version tương ứng.
+
+Dùng version thay cho updated_at: now() là thời điểm bắt đầu transaction, transaction
+commit muộn có thể mang mốc thời gian sớm hơn mốc client đã đồng bộ.
+
+Revision ID: 0006_board_delta_sync
+Revises: 0005_outbox_events
+Create Date: 2026-10-18 00:00:04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006_board_delta_sync"
+down_revision: Union[str, None] = "0005_outbox_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS = """
+CREATE FUNCTION columns_sync_stamp() RETURNS trigger AS $$
+BEGIN
+    NEW.sync_version := coalesce((SELECT version FROM boards WHERE id = NEW.board_id), 0);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER columns_sync_stamp
+    BEFORE INSERT OR UPDATE ON columns
+    FOR EACH ROW EXECUTE FUNCTION columns_sync_stamp();
+
+CREATE FUNCTION columns_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (board_id, entity, entity_id, version)
+    SELECT id, 'column', OLD.id, version FROM boards WHERE id = OLD.board_id;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER columns_sync_tombstone
+    AFTER DELETE ON columns
+    FOR EACH ROW EXECUTE FUNCTION columns_sync_tombstone();
+
+CREATE FUNCTION cards_sync_stamp() RETURNS trigger AS $$
+DECLARE
+    new_board_id integer;
+    new_version integer;
+    old_board_id integer;
+BEGIN
+    SELECT c.board_id, b.version INTO new_board_id, new_version
+    FROM columns c JOIN boards b ON b.id = c.board_id
+    WHERE c.id = NEW.column_id;
+    NEW.sync_version := coalesce(new_version, 0);
+
+    -- Card chuyển sang board khác: board cũ cần tombstone
+    IF TG_OP = 'UPDATE' AND NEW.column_id IS DISTINCT FROM OLD.column_id THEN
+        SELECT board_id INTO old_board_id FROM columns WHERE id = OLD.column_id;
+        IF old_board_id IS DISTINCT FROM new_board_id THEN
+            INSERT INTO sync_tombstones (board_id, entity, entity_id, version)
+            SELECT id, 'card', OLD.id, version FROM boards WHERE id = old_board_id;
+        END IF;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER cards_sync_stamp
+    BEFORE INSERT OR UPDATE OF title, description, position, is_archived, column_id ON cards
+    FOR EACH ROW EXECUTE FUNCTION cards_sync_stamp();
+
+CREATE FUNCTION cards_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    -- Column đã bị xoá cùng lúc (cascade): tombstone của column là đủ
+    INSERT INTO sync_tombstones (board_id, entity, entity_id, version)
+    SELECT b.id, 'card', OLD.id, b.version
+    FROM columns c JOIN boards b ON b.id = c.board_id
+    WHERE c.id = OLD.column_id;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER cards_sync_tombstone
+    AFTER DELETE ON cards
+    FOR EACH ROW EXECUTE FUNCTION cards_sync_tombstone();
+
+CREATE FUNCTION boards_sync_cleanup() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM sync_tombstones WHERE board_id = OLD.id;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER boards_sync_cleanup
+    AFTER DELETE ON boards
+    FOR EACH ROW EXECUTE FUNCTION boards_sync_cleanup();
+"""
+
+
+def upgrade() -> None:
+    op.add_column("columns", sa.Column("sync_version", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("cards", sa.Column("sync_version", sa.Integer(), server_default="0", nullable=False))
+
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("board_id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_sync_tombstones_board_id_version", "sync_tombstones", ["board_id", "version"])
+
+    op.execute(TRIGGERS)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_columns_board_id_sync_version", "columns", ["board_id", "sync_version"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_cards_column_id_sync_version", "cards", ["column_id", "sync_version"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_cards_column_id_sync_version", table_name="cards", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_columns_board_id_sync_version", table_name="columns", postgresql_concurrently=True, if_exists=True)
+
+    op.execute("DROP TRIGGER IF EXISTS boards_sync_cleanup ON boards")
+    op.execute("DROP TRIGGER IF EXISTS cards_sync_tombstone ON cards")
+    op.execute("DROP TRIGGER IF EXISTS cards_sync_stamp ON cards")
+    op.execute("DROP TRIGGER IF EXISTS columns_sync_tombstone ON columns")
+    op.execute("DROP TRIGGER IF EXISTS columns_sync_stamp ON columns")
+    for function in (
+        "boards_sync_cleanup", "cards_sync_tombstone", "cards_sync_stamp",
+        "columns_sync_tombstone", "columns_sync_stamp"
+    ):
+        op.execute(f"DROP FUNCTION IF EXISTS {function}()")
+
+    op.drop_index("ix_sync_tombstones_board_id_version", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
+    op.drop_column("cards", "sync_version")
+    op.drop_column("columns", "sync_version")
@@ -0,0 +1,113 @@
+"""ON DELETE CASCADE cho các khoá ngoại, cột boards.purge_requested_at
+
+- Xoá board / column / card để DB tự xoá dòng con, thay vì ORM load và xoá từng dòng.
+- FK mới được tạo NOT VALID rồi VALIDATE riêng: không khoá ghi trên bảng lớn trong
+  lúc kiểm tra dữ liệu cũ.
+- Board đang được xoá dần (purge_requested_at) không sinh tombstone cho delta sync.
+
+Revision ID: 0007_cascade_deletes
+Revises: 0006_board_delta_sync
+Create Date: 2026-10-18 00:00:05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007_cascade_deletes"
+down_revision: Union[str, None] = "0006_board_delta_sync"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (bảng, cột, bảng tham chiếu) - tên constraint là tên mặc định của Postgres
+FOREIGN_KEYS = [
+    ("board_members", "board_id", "boards"),
+    ("labels", "board_id", "boards"),
+    ("columns", "board_id", "boards"),
+    ("cards", "column_id", "columns"),
+    ("card_assignments", "card_id", "cards"),
+    ("card_labels", "card_id", "cards"),
+    ("card_labels", "label_id", "labels"),
+]
+
+TOMBSTONE_TRIGGERS = """
+CREATE OR REPLACE FUNCTION columns_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (board_id, entity, entity_id, version)
+    SELECT id, 'column', OLD.id, version FROM boards
+    WHERE id = OLD.board_id AND purge_requested_at IS NULL;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION cards_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    -- Column đã bị xoá cùng lúc (cascade): tombstone của column là đủ
+    INSERT INTO sync_tombstones (board_id, entity, entity_id, version)
+    SELECT b.id, 'card', OLD.id, b.version
+    FROM columns c JOIN boards b ON b.id = c.board_id
+    WHERE c.id = OLD.column_id AND b.purge_requested_at IS NULL;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_TOMBSTONE_TRIGGERS = """
+CREATE OR REPLACE FUNCTION columns_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (board_id, entity, entity_id, version)
+    SELECT id, 'column', OLD.id, version FROM boards WHERE id = OLD.board_id;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION cards_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (board_id, entity, entity_id, version)
+    SELECT b.id, 'card', OLD.id, b.version
+    FROM columns c JOIN boards b ON b.id = c.board_id
+    WHERE c.id = OLD.column_id;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referred in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referred, [column], ["id"],
+            ondelete=ondelete, postgresql_not_valid=True
+        )
+
+
+def _validate_foreign_keys() -> None:
+    for table, column, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+
+def upgrade() -> None:
+    op.add_column("boards", sa.Column("purge_requested_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(TOMBSTONE_TRIGGERS)
+    _replace_foreign_keys("CASCADE")
+
+    with op.get_context().autocommit_block():
+        _validate_foreign_keys()
+        op.create_index(
+            "ix_labels_board_id", "labels", ["board_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(None)
+    op.execute(PREVIOUS_TOMBSTONE_TRIGGERS)
+    op.drop_column("boards", "purge_requested_at")
+
+    with op.get_context().autocommit_block():
+        _validate_foreign_keys()
+        op.drop_index("ix_labels_board_id", table_name="labels", postgresql_concurrently=True, if_exists=True)
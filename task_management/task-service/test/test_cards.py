@@ -0,0 +1,82 @@
+def _create_card(client, auth, column: dict, user_id: int = 1, **fields) -> dict:
+    response = client.post(
+        "/api/v1/cards/", json={"title": "Card", "column_id": column["id"], **fields}, headers=auth(user_id)
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_update_cannot_move_card_out_of_a_foreign_board(client, auth, make_board):
+    _, foreign_column = make_board(user_id=2, title="Private")
+    card = _create_card(client, auth, foreign_column, user_id=2)
+    _, own_column = make_board(user_id=1)
+
+    assert client.get(f"/api/v1/cards/{card['id']}", headers=auth(1)).status_code == 404
+
+    response = client.patch(f"/api/v1/cards/{card['id']}", json={"column_id": own_column["id"]}, headers=auth(1))
+    assert response.status_code == 404
+
+    unchanged = client.get(f"/api/v1/cards/{card['id']}", headers=auth(2))
+    assert unchanged.status_code == 200
+    assert unchanged.json()["column_id"] == foreign_column["id"]
+
+
+
+def _labelled_card(client, auth, make_board) -> tuple[dict, dict, int]:
+    """Board mới kèm một card gắn một label của board đó: (board, card, label_id)."""
+    from sqlalchemy import insert
+    from app.db import engine
+    from app.models.task import Label, card_labels
+
+    board, column = make_board(title="Source")
+    card = _create_card(client, auth, column)
+    with engine.begin() as conn:
+        label_id = conn.scalar(insert(Label).values(title="Bug", color="red", board_id=board["id"]).returning(Label.id))
+        conn.execute(insert(card_labels).values(card_id=card["id"], label_id=label_id))
+    return board, card, label_id
+
+
+def _card_label_ids(card_id: int) -> list[int]:
+    from sqlalchemy import select
+    from app.db import engine
+    from app.models.task import card_labels
+
+    with engine.connect() as conn:
+        return conn.scalars(select(card_labels.c.label_id).where(card_labels.c.card_id == card_id)).all()
+
+
+def _add_column(client, auth, board: dict) -> dict:
+    response = client.post("/api/v1/columns/", json={"title": "Doing", "board_id": board["id"]}, headers=auth(1))
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_update_moving_card_to_another_board_drops_its_labels(client, auth, make_board):
+    _, moved, _ = _labelled_card(client, auth, make_board)
+    board, kept, label_id = _labelled_card(client, auth, make_board)
+    _, target_column = make_board(title="Target")
+
+    response = client.patch(f"/api/v1/cards/{moved['id']}", json={"column_id": target_column["id"]}, headers=auth(1))
+    assert response.status_code == 200, response.text
+    assert _card_label_ids(moved["id"]) == []
+
+    # Chuyển column trong cùng board: label giữ nguyên
+    response = client.patch(f"/api/v1/cards/{kept['id']}", json={"column_id": _add_column(client, auth, board)["id"]}, headers=auth(1))
+    assert response.status_code == 200, response.text
+    assert _card_label_ids(kept["id"]) == [label_id]
+
+
+def test_bulk_move_to_another_board_drops_its_labels(client, auth, make_board):
+    _, moved, _ = _labelled_card(client, auth, make_board)
+    board, kept, label_id = _labelled_card(client, auth, make_board)
+    _, target_column = make_board(title="Target")
+
+    response = client.post("/api/v1/cards/bulk", json={"items": [
+        {"card_id": moved["id"], "column_id": target_column["id"]},
+        {"card_id": kept["id"], "column_id": _add_column(client, auth, board)["id"]},
+    ]}, headers=auth(1))
+    assert response.status_code == 200, response.text
+    assert [result["ok"] for result in response.json()] == [True, True]
+
+    assert _card_label_ids(moved["id"]) == []
+    assert _card_label_ids(kept["id"]) == [label_id]
@@ -0,0 +1,26 @@
+def test_get_columns_projects_card_fields(client, auth, make_board):
+    board, column = make_board()
+    for title in ("first", "archived", "second"):
+        response = client.post(
+            "/api/v1/cards/",
+            json={"title": title, "description": "x" * 1000, "column_id": column["id"]},
+            headers=auth(1)
+        )
+        assert response.status_code == 200, response.text
+        if title == "archived":
+            assert client.delete(f"/api/v1/cards/{response.json()['id']}", headers=auth(1)).status_code == 200
+
+    default = client.get("/api/v1/columns/", params={"board_id": board["id"]}, headers=auth(1))
+    assert default.status_code == 200, default.text
+    [listed] = default.json()
+    assert [card["title"] for card in listed["cards"]] == ["first", "second"]
+    assert all("description" not in card for card in listed["cards"])
+
+    projected = client.get("/api/v1/columns/", params={"board_id": board["id"], "fields": "title"}, headers=auth(1))
+    assert projected.status_code == 200, projected.text
+    assert [set(card) for card in projected.json()[0]["cards"]] == [{"id", "title", "column_id"}] * 2
+
+    unknown = client.get("/api/v1/columns/", params={"board_id": board["id"], "fields": "secret"}, headers=auth(1))
+    assert unknown.status_code == 400
+
+    assert client.get("/api/v1/columns/", params={"board_id": board["id"]}, headers=auth(2)).json() == []
@@ -0,0 +1,36 @@
+import json
+
+
+def test_export_releases_request_connection_while_streaming(client, auth, make_board, monkeypatch):
+    from app.core.acl_cache import acl_cache
+    from app.db import async_engine
+    from app.routers import board as board_router
+
+    board, column = make_board()
+    card = client.post("/api/v1/cards/", json={"title": "Card", "column_id": column["id"]}, headers=auth(1))
+    assert card.status_code == 200, card.text
+
+    checked_out = []
+    stream = board_router.stream_board_ndjson
+
+    def recording_stream(board_id):
+        # Connection async (của request) còn bị giữ khi bắt đầu stream?
+        checked_out.append(async_engine.sync_engine.pool.checkedout())
+        yield from stream(board_id)
+
+    monkeypatch.setattr(board_router, "stream_board_ndjson", recording_stream)
+    # Quyền được kiểm tra bằng query, không phải từ ACL cache
+    acl_cache.invalidate_board(board["id"])
+
+    response = client.get(f"/api/v1/boards/{board['id']}/export", headers=auth(1))
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert {(record["type"], record["id"]) for record in records if record["type"] in ("board", "card")} == {
+        ("board", board["id"]), ("card", card.json()["id"])
+    }
+    assert checked_out == [0]
+
+
+def test_export_requires_membership(client, auth, make_board):
+    board, _ = make_board(user_id=2)
+    assert client.get(f"/api/v1/boards/{board['id']}/export", headers=auth(1)).status_code == 404
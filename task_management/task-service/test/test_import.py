@@ -0,0 +1,49 @@
+import json
+
+
+def _import_trello(client, auth, export: dict) -> dict:
+    response = client.post(
+        "/api/v1/boards/import",
+        files={"file": ("board.json", json.dumps(export), "application/json")},
+        headers=auth(1)
+    )
+    assert response.status_code == 201, response.text
+    board = client.get(f"/api/v1/boards/{response.json()['board_id']}", headers=auth(1))
+    assert board.status_code == 200, board.text
+    return board.json()
+
+
+def test_trello_import_orders_cards_by_pos(client, auth):
+    board = _import_trello(client, auth, {
+        "name": "Trello board",
+        "lists": [
+            {"id": "done", "name": "Done", "pos": 2},
+            {"id": "todo", "name": "Todo", "pos": 1},
+        ],
+        "cards": [
+            {"id": "c1", "name": "second", "idList": "todo", "pos": 2},
+            {"id": "c2", "name": "first", "idList": "todo", "pos": 1},
+            {"id": "c3", "name": "fourth", "idList": "todo", "pos": 16384},
+            {"id": "c4", "name": "third", "idList": "todo", "pos": 8192.5},
+            {"id": "c5", "name": "shipped", "idList": "done", "pos": 1},
+            {"id": "c6", "name": "released", "idList": "done", "pos": 5},
+        ],
+    })
+
+    assert [column["title"] for column in board["columns"]] == ["Todo", "Done"]
+    todo, done = board["columns"]
+    assert [card["title"] for card in todo["cards"]] == ["first", "second", "third", "fourth"]
+    assert [card["title"] for card in done["cards"]] == ["shipped", "released"]
+
+
+def test_trello_import_keeps_file_order_for_equal_pos(client, auth):
+    board = _import_trello(client, auth, {
+        "lists": [{"id": "todo", "name": "Todo", "pos": 1}],
+        "cards": [
+            {"id": "c1", "name": "b", "idList": "todo", "pos": 2},
+            {"id": "c2", "name": "a1", "idList": "todo", "pos": 1},
+            {"id": "c3", "name": "a2", "idList": "todo", "pos": 1},
+        ],
+    })
+
+    assert [card["title"] for card in board["columns"][0]["cards"]] == ["a1", "a2", "b"]
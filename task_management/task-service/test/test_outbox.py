@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+
+
+def _update_card(client, auth, board, column):
+    card = client.post("/api/v1/cards/", json={"title": "Card", "column_id": column["id"]}, headers=auth(1))
+    assert card.status_code == 200, card.text
+    return (
+        lambda: client.patch(f"/api/v1/cards/{card.json()['id']}", json={"title": "Renamed"}, headers=auth(1)),
+        "card.updated"
+    )
+
+
+def _add_member(client, auth, board, column):
+    return (
+        lambda: client.post(f"/api/v1/boards/{board['id']}/members", json={"user_id": 2}, headers=auth(1)),
+        "board.member_added"
+    )
+
+
+def _delete_permanently(client, auth, board, column):
+    closed = client.delete(f"/api/v1/boards/{board['id']}", headers=auth(1))
+    assert closed.status_code == 200, closed.text
+    return (
+        lambda: client.delete(f"/api/v1/boards/{board['id']}", params={"permanent": True}, headers=auth(1)),
+        "board.deleted"
+    )
+
+
+@pytest.mark.parametrize("write", [_update_card, _add_member, _delete_permanently])
+def test_board_events_follow_commit_order(client, auth, make_board, write):
+    """
+    Mọi thao tác ghi event của board phải chờ khoá dòng board: event của nó xếp sau
+    event của transaction đang giữ khoá, đúng thứ tự commit.
+    """
+    from app.db import engine
+
+    board, column = make_board()
+    request, event_type = write(client, auth, board, column)
+    responses = []
+
+    with engine.connect() as conn:
+        # Transaction khác đang ghi board (vd. một lần cập nhật card) và giữ khoá tới commit
+        conn.execute(text("UPDATE boards SET version = version + 1 WHERE id = :id"), {"id": board["id"]})
+        worker = threading.Thread(target=lambda: responses.append(request()))
+        worker.start()
+        worker.join(0.5)
+        assert worker.is_alive(), "write did not wait for the board row lock"
+
+        conn.execute(
+            text("INSERT INTO outbox_events (board_id, event_type, payload) VALUES (:id, 'test.concurrent', '{}')"),
+            {"id": board["id"]}
+        )
+        conn.commit()
+
+    worker.join(10)
+    assert responses and responses[0].status_code < 300, responses and responses[0].text
+
+    with engine.connect() as conn:
+        events = conn.execute(
+            text("SELECT event_type FROM outbox_events WHERE board_id = :id ORDER BY id"), {"id": board["id"]}
+        ).scalars().all()
+    assert events[-2:] == ["test.concurrent", event_type]
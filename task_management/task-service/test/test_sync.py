@@ -0,0 +1,44 @@
+def _changes(client, auth, board: dict, since: int) -> dict:
+    response = client.get(f"/api/v1/boards/{board['id']}/changes", params={"since": since}, headers=auth(1))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _tombstone_count(board: dict) -> int:
+    from sqlalchemy import func, select
+    from app.db import engine
+    from app.models.task import SyncTombstone
+
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).where(SyncTombstone.board_id == board["id"]))
+
+
+def test_tombstones_older_than_retention_are_pruned(client, auth, make_board, monkeypatch):
+    from app.core.config import settings
+    from app.services.sync_tombstones import SyncTombstonePruner
+
+    monkeypatch.setattr(settings, "BOARD_SYNC_TOMBSTONE_VERSIONS", 3)
+    board, column = make_board()
+    _, other_column = make_board(title="Other")
+
+    card = client.post("/api/v1/cards/", json={"title": "Moved", "column_id": column["id"]}, headers=auth(1)).json()
+    before_move = _changes(client, auth, board, 0)["version"]
+    # Chuyển sang board khác: board cũ có tombstone
+    response = client.patch(f"/api/v1/cards/{card['id']}", json={"column_id": other_column["id"]}, headers=auth(1))
+    assert response.status_code == 200, response.text
+    assert _changes(client, auth, board, before_move)["deleted_card_ids"] == [card["id"]]
+
+    for index in range(3):
+        client.post("/api/v1/cards/", json={"title": f"Card {index}", "column_id": column["id"]}, headers=auth(1))
+    version = _changes(client, auth, board, 0)["version"]
+    assert version == before_move + 4
+
+    pruner = SyncTombstonePruner(keep_versions=settings.BOARD_SYNC_TOMBSTONE_VERSIONS, chunk_size=1, interval=1)
+    assert pruner.prune() == 1
+    assert _tombstone_count(board) == 0
+
+    # `since` trước tombstone đã xoá: phải tải lại cả board
+    assert _changes(client, auth, board, before_move)["reset"] is True
+    recent = _changes(client, auth, board, version - 3)
+    assert recent["reset"] is False
+    assert [card["title"] for card in recent["cards"]] == ["Card 0", "Card 1", "Card 2"]
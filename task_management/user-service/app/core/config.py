@@ -8,6 +8,15 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REDIS_URL: str
 
+    # Connection pool của SQLAlchemy
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Kết nối qua PgBouncer ở chế độ transaction pooling
+    DB_PGBOUNCER: bool = False
+
     # admin account
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_PASSWORD: str
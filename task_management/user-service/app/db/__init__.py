@@ -2,8 +2,10 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
+from .pool import engine_options, instrument_pool
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **engine_options("user"))
+instrument_pool(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
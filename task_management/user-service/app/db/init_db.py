@@ -1,11 +1,34 @@
 # app/db/init_db.py
 
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 from ..core.config import settings
 from ..auth.security import get_password_hash
 from ..models.user import User
 from ..schemas.user import UserCreate # Imported but not used
 
+# Index thêm vào model sau khi bảng đã có dữ liệu: create_all không thêm index vào bảng
+# đã tồn tại, nên được tạo ở đây. CONCURRENTLY không khoá ghi trên bảng users.
+POST_CREATE_INDEXES = {
+    "idx_user_created_at_id": "users (created_at, id)",
+}
+
+
+def ensure_indexes(engine: Engine) -> None:
+    # CONCURRENTLY không chạy được trong transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, target in POST_CREATE_INDEXES.items():
+            # Lần build CONCURRENTLY trước bị dừng giữa chừng để lại index INVALID: build lại
+            invalid = conn.scalar(text(
+                "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name"
+            ), {"name": name})
+            if invalid:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}"))
+
+
 def init_db(db: Session) -> None:
     user = db.query(User).filter(User.email == settings.FIRST_SUPERUSER).first()
     
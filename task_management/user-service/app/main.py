@@ -9,7 +9,7 @@ from app.core.config import settings
 
 # Import DB
 from .db import engine, SessionLocal
-from .db.init_db import init_db
+from .db.init_db import init_db, ensure_indexes
 from .models import Base
 
 # Import Redis & Logging
@@ -30,6 +30,10 @@ async def lifespan(app: FastAPI):
 
     # 1. Init Database
     Base.metadata.create_all(bind=engine)
+    try:
+        ensure_indexes(engine)
+    except Exception as e:
+        logger.error(f"❌ Index creation failed: {e}")
     db = SessionLocal()
     try:
         init_db(db)
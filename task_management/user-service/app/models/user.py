@@ -28,4 +28,6 @@ class User(Base):
         Index('idx_user_active_role', 'is_active', 'role'),
 
         Index('idx_user_email', 'email'),
+
+        Index('idx_user_created_at_id', 'created_at', 'id'),
     )
\ No newline at end of file
@@ -1,16 +1,38 @@
 # user-service/app/services/admin_service.py
 
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import or_, tuple_
 from fastapi import HTTPException
+from ..core.pagination import encode_cursor, decode_cursor
 from ..models.user import User
 
 class AdminService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all_users(self, skip: int = 0, limit: int = 100):
-        return self.db.query(User).filter(User.role == "user").offset(skip).limit(limit).all()
+    def _paginate(self, query: Query, cursor: Optional[str], limit: int) -> dict:
+        # Keyset pagination trên (created_at, id), mới nhất trước
+        if cursor:
+            created_at, last_id = decode_cursor(cursor, size=2)
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.filter(tuple_(User.created_at, User.id) < tuple_(created_at, last_id))
+
+        users = query.order_by(User.created_at.desc(), User.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].created_at.isoformat(), users[-1].id)
+        return {"items": users, "next_cursor": next_cursor}
+
+    def get_all_users(self, cursor: Optional[str] = None, limit: int = 100):
+        return self._paginate(self.db.query(User).filter(User.role == "user"), cursor, limit)
 
     def get_user_by_id(self, user_id: int):
         user = self.db.query(User).filter(User.id == user_id).first()
@@ -27,15 +49,15 @@ class AdminService:
             self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to delete: {str(e)}")
         
-    def search_users(self, keyword: str, skip: int = 0, limit: int = 100):
+    def search_users(self, keyword: str, cursor: Optional[str] = None, limit: int = 100):
         search_pattern = f"%{keyword}%"
         
-        users = self.db.query(User).filter(
+        query = self.db.query(User).filter(
             or_(
                 User.email.ilike(search_pattern),      # Tìm trong Email
                 User.first_name.ilike(search_pattern), # Tìm trong Tên
                 User.last_name.ilike(search_pattern)   # Tìm trong Họ
             )
-        ).offset(skip).limit(limit).all()
+        )
         
-        return users
\ No newline at end of file
+        return self._paginate(query, cursor, limit)
\ No newline at end of file